@@ -10,16 +10,20 @@ from config import CONFIG
 from database import init_database
 from styles import inject_custom_css
 from logger_setup import logger
-from views import (
-    render_dashboard,
-    render_record_buying,
-    render_record_selling,
-    render_view_transactions,
-    render_pending_inventory,
-    render_ledger,
-    render_settings,
-    render_parties
-)
+import views
+
+
+# Sidebar label -> renderer name in the views package (resolved lazily)
+PAGES = {
+    "🏠 Dashboard": "render_dashboard",
+    "👥 Contacts": "render_parties",
+    "📥 Record Buying": "render_record_buying",
+    "📤 Record Selling": "render_record_selling",
+    "📋 All Transactions": "render_view_transactions",
+    "📦 Pending Inventory": "render_pending_inventory",
+    "💰 Ledger": "render_ledger",
+    "⚙️ Settings": "render_settings",
+}
 
 
 def main() -> None:
@@ -42,10 +46,9 @@ def main() -> None:
             return
         
         # Initialize session state
-        if 'show_delete_confirmation' not in st.session_state:
-            st.session_state.show_delete_confirmation = False
-        if 'transaction_to_delete' not in st.session_state:
-            st.session_state.transaction_to_delete = None
+        st.session_state.setdefault('show_delete_confirmation', False)
+        st.session_state.setdefault('transaction_to_delete', None)
+        # Only format the timestamp when the key is actually missing
         if 'last_refresh' not in st.session_state:
             st.session_state.last_refresh = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
@@ -56,42 +59,15 @@ def main() -> None:
             
             page = st.radio(
                 "Navigate",
-                [
-                    "🏠 Dashboard",
-                    "👥 Contacts",
-                    "📥 Record Buying",
-                    "📤 Record Selling",
-                    "📋 All Transactions",
-                    "📦 Pending Inventory",
-                    "💰 Ledger",
-                    "⚙️ Settings"
-                ],
+                list(PAGES),
                 label_visibility="collapsed"
             )
             
             st.markdown("---")
             st.caption(f"Last updated: {st.session_state.last_refresh}")
         
-        # Clean page name
-        page_name = page.split(" ", 1)[1] if " " in page else page
-        
-        # Route to appropriate page
-        if page_name == "Dashboard":
-            render_dashboard()
-        elif page_name == "Contacts":
-            render_parties()
-        elif page_name == "Record Buying":
-            render_record_buying()
-        elif page_name == "Record Selling":
-            render_record_selling()
-        elif page_name == "All Transactions":
-            render_view_transactions()
-        elif page_name == "Pending Inventory":
-            render_pending_inventory()
-        elif page_name == "Ledger":
-            render_ledger()
-        elif page_name == "Settings":
-            render_settings()
+        # Route to the selected page; only its module gets imported
+        getattr(views, PAGES[page])()
             
     except Exception as e:
         logger.error(f"Application error: {e}")
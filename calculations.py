@@ -8,6 +8,15 @@ from config import CONFIG
 from logger_setup import logger
 
 
+# Charge rates bound once at import (CONFIG is frozen)
+_MANDI_RATE = CONFIG.MANDI_CHARGE_RATE
+_MUDDAT_RATE = CONFIG.MUDDAT_RATE
+_TRACTOR_RENT = CONFIG.TRACTOR_RENT_PER_QUINTAL
+_CASH_DISCOUNT_RATE = CONFIG.CASH_DISCOUNT_RATE
+_LABOUR_CHARGE = CONFIG.LABOUR_CHARGE_PER_QUINTAL
+_TRANSPORT_CHARGE = CONFIG.TRANSPORT_CHARGE_PER_QUINTAL
+
+
 def calculate_buying_price(
     buying_price: float,
     weight_quintal: float
@@ -31,9 +40,9 @@ def calculate_buying_price(
     if weight_quintal <= 0:
         raise ValueError("Weight must be positive")
     
-    mandi_charge = CONFIG.MANDI_CHARGE_RATE * buying_price
-    tractor_rent = CONFIG.TRACTOR_RENT_PER_QUINTAL * weight_quintal
-    muddat = CONFIG.MUDDAT_RATE * buying_price
+    mandi_charge = _MANDI_RATE * buying_price
+    tractor_rent = _TRACTOR_RENT * weight_quintal
+    muddat = _MUDDAT_RATE * buying_price
     total_buying_price = buying_price + mandi_charge + tractor_rent + muddat
     
     return total_buying_price, mandi_charge, tractor_rent, muddat
@@ -62,9 +71,9 @@ def calculate_selling_price(
     if weight_quintal <= 0:
         raise ValueError("Weight must be positive")
     
-    cash_discount = CONFIG.CASH_DISCOUNT_RATE * selling_price
-    labour_charge = CONFIG.LABOUR_CHARGE_PER_QUINTAL * weight_quintal
-    transport_charge = CONFIG.TRANSPORT_CHARGE_PER_QUINTAL * weight_quintal
+    cash_discount = _CASH_DISCOUNT_RATE * selling_price
+    labour_charge = _LABOUR_CHARGE * weight_quintal
+    transport_charge = _TRANSPORT_CHARGE * weight_quintal
     total_selling_price = selling_price - cash_discount - labour_charge - transport_charge
     
     # Ensure total is not negative
@@ -5,13 +5,23 @@ Configuration settings for the Buying & Selling Dashboard Application.
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AppConfig:
-    """Application configuration settings"""
+    """Application configuration settings (immutable; shared as CONFIG)"""
     DB_PATH: str = "transactions.db"
     APP_TITLE: str = "Buying & Selling Dashboard"
     PAGE_LAYOUT: str = "wide"
     
+    # Optional PostgreSQL session settings sent in the connection startup
+    # packet, e.g. "-c work_mem=64MB -c lock_timeout=3000". Off by default:
+    # transaction-mode poolers (Supabase's pgbouncer) reject the parameter.
+    DB_SESSION_OPTIONS: str = ""
+    DB_CONNECT_TIMEOUT: int = 10  # Seconds to wait for a new connection
+    DB_POOL_MIN_CONN: int = 1
+    DB_POOL_MAX_CONN: int = 10
+    QUERY_CACHE_TTL: int = 300  # Seconds cached reads stay valid without a write
+    DB_BATCH_PAGE_SIZE: int = 1000  # Rows per multi-row INSERT statement
+    
     # Transaction rates and percentages
     MANDI_CHARGE_RATE: float = 0.015  # 1.5%
     MUDDAT_RATE: float = 0.015  # 1.5%
@@ -31,7 +41,8 @@ class AppConfig:
     MAX_NAME_LENGTH: int = 100
     MAX_ITEM_NAME_LENGTH: int = 100
     MAX_NOTES_LENGTH: int = 500
+    ALLOW_UNICODE_NAMES: bool = False  # Accept non-ASCII letters in names/items
 
 
-# Initialize global configuration
+# Initialize global configuration (read-only singleton)
 CONFIG = AppConfig()
@@ -4,32 +4,189 @@ Uses PostgreSQL (Supabase) for cloud persistence.
 """
 
 import psycopg2
-from psycopg2 import sql
+from psycopg2 import pool, sql
 from psycopg2.extras import RealDictCursor
 import pandas as pd
+from pandas.api.types import is_numeric_dtype, is_object_dtype
 from datetime import datetime
 from contextlib import contextmanager
-from typing import Optional
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple, Union
 import streamlit as st
+import io
 import os
 
 from config import CONFIG
 from logger_setup import logger
 
 
+# total_amount is derived from the stored charges: BUY rows carry mandi,
+# tractor and muddat on top of the base amount, SELL rows deduct discount,
+# labour and transport (floored at zero, as in calculate_selling_price).
+# The columns are REAL; casting the first operand makes the whole sum run in
+# float8, so only the final store rounds to float4.
+_TOTAL_AMOUNT_EXPR = '''GREATEST(
+        base_amount::float8 + COALESCE(mandi_charge, 0) + COALESCE(tractor_rent, 0) + COALESCE(muddat, 0)
+        - COALESCE(cash_discount, 0) - COALESCE(labour_charge, 0) - COALESCE(transport_charge, 0),
+        0
+    )'''
+_TOTAL_AMOUNT_DEF = f"REAL GENERATED ALWAYS AS ({_TOTAL_AMOUNT_EXPR}) STORED"
+
+# Largest difference between a stored and a recomputed total that the
+# total_amount migration treats as rounding rather than a real discrepancy:
+# 0.01 absolute, or relative for large totals, where one float4 rounding step
+# of the stored REAL values already exceeds a paisa (~6e-8 relative each)
+_TOTAL_AMOUNT_TOLERANCE = 0.01
+_TOTAL_AMOUNT_REL_TOLERANCE = 1e-6
+
+# Schema DDL, each sent to the server as one multi-statement script
+_SCHEMA_DDL = f'''
+CREATE TABLE IF NOT EXISTS parties (
+    id SERIAL PRIMARY KEY,
+    name TEXT NOT NULL,
+    phone TEXT,
+    address TEXT,
+    party_type TEXT NOT NULL DEFAULT 'BOTH' CHECK(party_type IN ('BUYER', 'SELLER', 'BOTH')),
+    notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS transactions (
+    id SERIAL PRIMARY KEY,
+    transaction_type TEXT NOT NULL CHECK(transaction_type IN ('BUY', 'SELL')),
+    buyer_name TEXT,
+    seller_name TEXT,
+    party_id INTEGER REFERENCES parties(id),
+    item_name TEXT NOT NULL,
+    quantity_kg REAL NOT NULL CHECK(quantity_kg > 0),
+    price_per_unit REAL NOT NULL CHECK(price_per_unit > 0),
+    base_amount REAL NOT NULL CHECK(base_amount >= 0),
+    mandi_charge REAL DEFAULT 0 CHECK(mandi_charge >= 0),
+    tractor_rent REAL DEFAULT 0 CHECK(tractor_rent >= 0),
+    muddat REAL DEFAULT 0 CHECK(muddat >= 0),
+    cash_discount REAL DEFAULT 0 CHECK(cash_discount >= 0),
+    labour_charge REAL DEFAULT 0 CHECK(labour_charge >= 0),
+    transport_charge REAL DEFAULT 0 CHECK(transport_charge >= 0),
+    total_amount {_TOTAL_AMOUNT_DEF},
+    amount_paid REAL DEFAULT 0 CHECK(amount_paid >= 0),
+    transaction_date TEXT NOT NULL,
+    notes TEXT,
+    status TEXT NOT NULL DEFAULT 'PENDING' CHECK(status IN ('PENDING', 'SOLD', 'COMPLETED')),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+'''
+
+# Columns added after the first release, applied to existing databases
+_ADDED_TRANSACTION_COLUMNS = (
+    ('party_id', 'INTEGER REFERENCES parties(id)'),
+)
+
+# Columns shown in recent-activity tables
+RECENT_TRANSACTION_COLUMNS = (
+    'id', 'transaction_type', 'item_name', 'quantity_kg',
+    'total_amount', 'transaction_date', 'status'
+)
+
+_INDEX_DDL = '''
+CREATE INDEX IF NOT EXISTS idx_tx_type_status_date
+    ON transactions(transaction_type, status, transaction_date DESC);
+DROP INDEX IF EXISTS idx_transaction_type;
+CREATE INDEX IF NOT EXISTS idx_status ON transactions(status);
+CREATE INDEX IF NOT EXISTS idx_tx_pending
+    ON transactions(id DESC) WHERE status = 'PENDING';
+CREATE INDEX IF NOT EXISTS idx_tx_buyer_id ON transactions(buyer_name, id DESC);
+DROP INDEX IF EXISTS idx_buyer_name;
+CREATE INDEX IF NOT EXISTS idx_tx_seller_id ON transactions(seller_name, id DESC);
+DROP INDEX IF EXISTS idx_seller_name;
+CREATE INDEX IF NOT EXISTS idx_party_id ON transactions(party_id);
+CREATE INDEX IF NOT EXISTS idx_item_name ON transactions(item_name);
+CREATE INDEX IF NOT EXISTS idx_transaction_date ON transactions(transaction_date);
+'''
+
+
 def get_database_url() -> str:
     """Get database URL from Streamlit secrets or environment."""
-    # Try Streamlit secrets first (for cloud deployment)
-    if hasattr(st, 'secrets') and 'DATABASE_URL' in st.secrets:
-        return st.secrets['DATABASE_URL']
+    # Try Streamlit secrets first (for cloud deployment); outside `streamlit
+    # run` (e.g. the migration command) there may be no secrets file at all
+    try:
+        if hasattr(st, 'secrets') and 'DATABASE_URL' in st.secrets:
+            return st.secrets['DATABASE_URL']
+    except Exception:
+        pass
     # Fall back to environment variable
     return os.environ.get('DATABASE_URL', '')
 
 
+def _connection_args() -> Tuple[str, Dict[str, Any]]:
+    """Return the DSN and keyword arguments used to open a connection."""
+    database_url = get_database_url()
+    if not database_url:
+        raise Exception("DATABASE_URL not configured. Please set it in Streamlit secrets.")
+    
+    connect_kwargs = {'connect_timeout': CONFIG.DB_CONNECT_TIMEOUT}
+    if CONFIG.DB_SESSION_OPTIONS:
+        connect_kwargs['options'] = CONFIG.DB_SESSION_OPTIONS
+    return database_url, connect_kwargs
+
+
+@st.cache_resource(show_spinner=False)
+def _get_connection_pool() -> pool.ThreadedConnectionPool:
+    """
+    Create the process-wide PostgreSQL connection pool.
+    
+    Cached with st.cache_resource so every rerun and session reuses the same
+    open connections instead of reconnecting on each query.
+    """
+    database_url, connect_kwargs = _connection_args()
+    logger.info("Creating database connection pool")
+    return pool.ThreadedConnectionPool(
+        CONFIG.DB_POOL_MIN_CONN,
+        CONFIG.DB_POOL_MAX_CONN,
+        database_url,
+        **connect_kwargs
+    )
+
+
+def _checkout(db_pool: pool.ThreadedConnectionPool):
+    """
+    Borrow a live connection from the pool.
+    
+    Idle pooled connections can be dropped by the server or a proxy without
+    the client noticing, so each one is pinged first; dead ones are closed
+    and replaced. Returns None when every pooled connection is in use.
+    """
+    last_error = None
+    # Every idle connection may be stale after a server restart
+    for _ in range(CONFIG.DB_POOL_MAX_CONN + 1):
+        try:
+            conn = db_pool.getconn()
+        except pool.PoolError:
+            return None
+        
+        try:
+            if not conn.closed:
+                with conn.cursor() as c:
+                    c.execute('SELECT 1')
+                conn.rollback()
+                return conn
+        except psycopg2.OperationalError as e:
+            last_error = e
+        
+        logger.warning("Discarding a dead pooled database connection")
+        db_pool.putconn(conn, close=True)
+    
+    raise last_error or psycopg2.OperationalError("No live database connection available")
+
+
 @contextmanager
 def get_db_connection():
     """
-    Context manager for PostgreSQL database connections.
+    Context manager that borrows a PostgreSQL connection from the pool.
+    
+    The connection is returned to the pool on exit; any transaction left
+    open by the caller is rolled back by the pool, and broken connections
+    are discarded. If the pool is exhausted, a dedicated connection is
+    opened instead and closed on exit.
     
     Yields:
         psycopg2.connection: Database connection object
@@ -37,89 +194,92 @@ def get_db_connection():
     Raises:
         psycopg2.Error: If database connection fails
     """
+    db_pool = None
     conn = None
     try:
-        database_url = get_database_url()
-        if not database_url:
-            raise Exception("DATABASE_URL not configured. Please set it in Streamlit secrets.")
-        
-        conn = psycopg2.connect(database_url)
+        db_pool = _get_connection_pool()
+        conn = _checkout(db_pool)
+        if conn is None:
+            logger.warning("Database connection pool exhausted; opening a dedicated connection")
+            db_pool = None
+            database_url, connect_kwargs = _connection_args()
+            conn = psycopg2.connect(database_url, **connect_kwargs)
         yield conn
     except psycopg2.Error as e:
         logger.error(f"Database connection error: {e}")
         raise
     finally:
-        if conn:
-            conn.close()
+        if conn is not None:
+            if db_pool is not None:
+                db_pool.putconn(conn, close=bool(conn.closed))
+            else:
+                conn.close()
+
+
+# Set once the schema has been checked in this process
+_schema_initialized = False
 
 
 def init_database() -> bool:
     """
     Initialize PostgreSQL database with required tables and indexes.
     
+    The schema is persistent, so the work runs once per process; later calls
+    (one per Streamlit rerun) return immediately.
+    
     Returns:
         bool: True if successful, False otherwise
     """
+    global _schema_initialized
+    if _schema_initialized:
+        return True
+    
     try:
         with get_db_connection() as conn:
             c = conn.cursor()
             
-            # Create parties table for contact management
-            c.execute('''CREATE TABLE IF NOT EXISTS parties (
-                id SERIAL PRIMARY KEY,
-                name TEXT NOT NULL,
-                phone TEXT,
-                address TEXT,
-                party_type TEXT NOT NULL DEFAULT 'BOTH' CHECK(party_type IN ('BUYER', 'SELLER', 'BOTH')),
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )''')
+            # Create tables in a single round trip
+            c.execute(_SCHEMA_DDL)
+            
+            # Add columns missing from databases created by older versions
+            c.execute(
+                '''SELECT column_name, is_generated, column_default FROM information_schema.columns
+                   WHERE table_schema = current_schema() AND table_name = %s''',
+                ('transactions',)
+            )
+            existing_columns = {name: (generated, default) for name, generated, default in c.fetchall()}
+            for col_name, col_def in _ADDED_TRANSACTION_COLUMNS:
+                if col_name not in existing_columns:
+                    c.execute(
+                        sql.SQL('ALTER TABLE transactions ADD COLUMN {} ' + col_def).format(
+                            sql.Identifier(col_name)
+                        )
+                    )
+                    logger.info(f"Added missing column transactions.{col_name}")
             
-            # Create transactions table (PostgreSQL syntax)
-            c.execute('''CREATE TABLE IF NOT EXISTS transactions (
-                id SERIAL PRIMARY KEY,
-                transaction_type TEXT NOT NULL CHECK(transaction_type IN ('BUY', 'SELL')),
-                buyer_name TEXT,
-                seller_name TEXT,
-                party_id INTEGER REFERENCES parties(id),
-                item_name TEXT NOT NULL,
-                quantity_kg REAL NOT NULL CHECK(quantity_kg > 0),
-                price_per_unit REAL NOT NULL CHECK(price_per_unit > 0),
-                base_amount REAL NOT NULL CHECK(base_amount >= 0),
-                mandi_charge REAL DEFAULT 0 CHECK(mandi_charge >= 0),
-                tractor_rent REAL DEFAULT 0 CHECK(tractor_rent >= 0),
-                muddat REAL DEFAULT 0 CHECK(muddat >= 0),
-                cash_discount REAL DEFAULT 0 CHECK(cash_discount >= 0),
-                labour_charge REAL DEFAULT 0 CHECK(labour_charge >= 0),
-                transport_charge REAL DEFAULT 0 CHECK(transport_charge >= 0),
-                total_amount REAL NOT NULL CHECK(total_amount >= 0),
-                amount_paid REAL DEFAULT 0 CHECK(amount_paid >= 0),
-                transaction_date TEXT NOT NULL,
-                notes TEXT,
-                status TEXT NOT NULL DEFAULT 'PENDING' CHECK(status IN ('PENDING', 'SOLD', 'COMPLETED')),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )''')
+            # Older databases store total_amount as a plain column, which
+            # inserts no longer fill; converting it rewrites the table, so it is
+            # left to the explicit migration rather than done at startup
+            if existing_columns.get('total_amount', (None, None))[0] == 'NEVER':
+                conn.rollback()
+                message = ("transactions.total_amount is a plain column from an older version. "
+                           "Run `python database.py migrate-total-amount` once to convert it.")
+                logger.error(message)
+                st.error(message)
+                return False
             
-            # Add party_id column if it doesn't exist (for existing databases)
-            # Using savepoint to allow partial rollback if column exists
-            try:
-                c.execute('SAVEPOINT add_party_id')
-                c.execute('ALTER TABLE transactions ADD COLUMN party_id INTEGER REFERENCES parties(id)')
-                c.execute('RELEASE SAVEPOINT add_party_id')
-            except psycopg2.Error:
-                c.execute('ROLLBACK TO SAVEPOINT add_party_id')  # Column already exists, rollback to savepoint
+            # The app stamps transaction_date in its local time; drop the
+            # server-time default an earlier version added. ALTER TABLE takes an
+            # ACCESS EXCLUSIVE lock, so only issue it when the default is present
+            if existing_columns.get('transaction_date', (None, None))[1] is not None:
+                c.execute('ALTER TABLE transactions ALTER COLUMN transaction_date DROP DEFAULT')
+                logger.info("Dropped the default for transactions.transaction_date")
             
             # Create indexes for better query performance
-            c.execute('CREATE INDEX IF NOT EXISTS idx_transaction_type ON transactions(transaction_type)')
-            c.execute('CREATE INDEX IF NOT EXISTS idx_status ON transactions(status)')
-            c.execute('CREATE INDEX IF NOT EXISTS idx_buyer_name ON transactions(buyer_name)')
-            c.execute('CREATE INDEX IF NOT EXISTS idx_seller_name ON transactions(seller_name)')
-            c.execute('CREATE INDEX IF NOT EXISTS idx_party_id ON transactions(party_id)')
-            c.execute('CREATE INDEX IF NOT EXISTS idx_item_name ON transactions(item_name)')
-            c.execute('CREATE INDEX IF NOT EXISTS idx_transaction_date ON transactions(transaction_date)')
+            c.execute(_INDEX_DDL)
             
             conn.commit()
+            _schema_initialized = True
             logger.info("Database initialized successfully")
             return True
             
@@ -133,20 +293,336 @@ def init_database() -> bool:
         return False
 
 
-def normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
-    """Normalize DataFrame types and fill missing values safely."""
+def migrate_total_amount() -> bool:
+    """
+    Convert a plain transactions.total_amount column to the generated one.
+    
+    One-off migration for databases created before total_amount was
+    generated. Every stored total is first compared with the generated
+    expression; if any row differs by more than _TOTAL_AMOUNT_TOLERANCE (or
+    _TOTAL_AMOUNT_REL_TOLERANCE of the total, whichever is larger) the
+    migration aborts without changing anything, so no historical value is
+    silently overwritten.
+    
+    Returns:
+        bool: True if the column is (now) generated, False otherwise
+    """
+    try:
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                '''SELECT is_generated FROM information_schema.columns
+                   WHERE table_schema = current_schema() AND table_name = %s
+                     AND column_name = %s''',
+                ('transactions', 'total_amount')
+            )
+            row = c.fetchone()
+            if row is None or row[0] != 'NEVER':
+                logger.info("transactions.total_amount needs no migration")
+                return True
+            
+            # A deliberate maintenance step may wait for the lock
+            c.execute("SET LOCAL lock_timeout = 0")
+            c.execute("LOCK TABLE transactions IN ACCESS EXCLUSIVE MODE")
+            c.execute(
+                f'''SELECT id, total_amount, {_TOTAL_AMOUNT_EXPR}
+                    FROM transactions
+                    WHERE total_amount IS NULL
+                       OR ABS(total_amount - {_TOTAL_AMOUNT_EXPR})
+                          > GREATEST(%s, ABS({_TOTAL_AMOUNT_EXPR}) * %s)
+                    ORDER BY id''',
+                (_TOTAL_AMOUNT_TOLERANCE, _TOTAL_AMOUNT_REL_TOLERANCE)
+            )
+            mismatches = c.fetchall()
+            if mismatches:
+                conn.rollback()
+                sample = ", ".join(
+                    f"ID {tx_id}: stored {stored}, computed {computed}"
+                    for tx_id, stored, computed in mismatches[:10]
+                )
+                logger.error(
+                    f"total_amount migration aborted: {len(mismatches)} rows differ "
+                    f"from the generated value ({sample}). Reconcile them first."
+                )
+                return False
+            
+            c.execute('ALTER TABLE transactions DROP COLUMN total_amount')
+            c.execute(f'ALTER TABLE transactions ADD COLUMN total_amount {_TOTAL_AMOUNT_DEF}')
+            conn.commit()
+            logger.info("Converted transactions.total_amount to a generated column")
+            return True
+    
+    except psycopg2.Error as e:
+        logger.error(f"total_amount migration failed: {e}")
+        return False
+
+
+def fetch_dataframe(
+    conn,
+    query: Union[str, sql.Composable],
+    params: Optional[tuple] = None,
+    parse_dates: Sequence[str] = ()
+) -> pd.DataFrame:
+    """
+    Run a query and build a DataFrame straight from the cursor's tuple rows.
+    
+    Skips pandas' generic DBAPI read path (and its per-call warning for
+    non-SQLAlchemy connections).
+    
+    Args:
+        conn: Open database connection
+        query: SQL query (string or psycopg2.sql composable) with %s placeholders
+        params: Optional query parameters
+        parse_dates: Columns to convert to datetime
+        
+    Returns:
+        DataFrame with one column per selected field
+    """
+    with conn.cursor() as c:
+        c.execute(query, params)
+        columns = [desc[0] for desc in c.description]
+        df = pd.DataFrame(c.fetchall(), columns=columns)
+    for col in parse_dates:
+        df[col] = pd.to_datetime(df[col], errors="coerce")
+    return df
+
+
+# Low-cardinality text columns stored as categoricals, so masks and groupbys
+# compare integer codes. transaction_type and status are fixed by their CHECK
+# constraints; item names repeat across trades, so their categories come
+# from the data.
+_CATEGORICAL_COLUMNS = {
+    'transaction_type': pd.CategoricalDtype(['BUY', 'SELL']),
+    'status': pd.CategoricalDtype(['PENDING', 'SOLD', 'COMPLETED']),
+    'item_name': 'category',
+}
+
+
+def normalize_dataframe(df: pd.DataFrame, compact: bool = False) -> pd.DataFrame:
+    """
+    Normalize DataFrame types and fill missing values safely.
+    
+    transaction_type, status and item_name become categoricals.
+    
+    Args:
+        df: DataFrame to normalize
+        compact: Downcast float64/int64 columns to the smallest dtype that
+            holds them. Only for display frames: float32 keeps ~7 significant
+            digits, so don't use it where amounts are summed or persisted.
+            
+    Returns:
+        Normalized DataFrame
+    """
     if df.empty:
         return df
-    normalized = df.copy()
-    numeric_cols = normalized.select_dtypes(include=["number"]).columns
-    object_cols = normalized.select_dtypes(include=["object"]).columns
-    if len(numeric_cols) > 0:
-        normalized[numeric_cols] = normalized[numeric_cols].fillna(0)
-    if len(object_cols) > 0:
-        normalized[object_cols] = normalized[object_cols].fillna("")
+    # One pass over the dtypes: numbers fill with 0, text with "", others untouched
+    fill_values = {
+        col: 0 if is_numeric_dtype(dtype) else ""
+        for col, dtype in df.dtypes.items()
+        if is_numeric_dtype(dtype) or is_object_dtype(dtype)
+    }
+    # fillna returns a new frame, so no defensive copy is needed
+    normalized = df.fillna(fill_values)
+    for col, dtype in _CATEGORICAL_COLUMNS.items():
+        if col in normalized.columns:
+            normalized[col] = normalized[col].astype(dtype)
+    if compact:
+        for col in normalized.select_dtypes(include=["float64"]).columns:
+            normalized[col] = pd.to_numeric(normalized[col], downcast="float")
+        for col in normalized.select_dtypes(include=["int64"]).columns:
+            normalized[col] = pd.to_numeric(normalized[col], downcast="integer")
     return normalized
 
 
+@st.cache_data(ttl=CONFIG.QUERY_CACHE_TTL, show_spinner=False)
+def _load_all_transactions() -> pd.DataFrame:
+    """Query all transactions; cached across reruns until a write clears it."""
+    with get_db_connection() as conn:
+        df = fetch_dataframe(
+            conn,
+            "SELECT * FROM transactions ORDER BY id DESC",
+            parse_dates=["transaction_date"]
+        )
+    return normalize_dataframe(df)
+
+
+@st.cache_data(ttl=CONFIG.QUERY_CACHE_TTL, show_spinner=False)
+def _load_pending_transactions() -> pd.DataFrame:
+    """Query pending transactions; cached across reruns until a write clears it."""
+    with get_db_connection() as conn:
+        df = fetch_dataframe(
+            conn,
+            "SELECT * FROM transactions WHERE status = 'PENDING' ORDER BY id DESC",
+            parse_dates=["transaction_date"]
+        )
+    return normalize_dataframe(df)
+
+
+@st.cache_data(ttl=CONFIG.QUERY_CACHE_TTL, show_spinner=False)
+def _load_transactions_projection(
+    columns: Tuple[str, ...],
+    where: str,
+    params: tuple
+) -> pd.DataFrame:
+    """Query selected transaction columns; cached across reruns until a write clears it."""
+    query = sql.SQL("SELECT {} FROM transactions").format(
+        sql.SQL(", ").join(sql.Identifier(col) for col in columns)
+    )
+    if where:
+        query = sql.SQL("{} WHERE {}").format(query, sql.SQL(where))
+    with get_db_connection() as conn:
+        df = fetch_dataframe(conn, query, params or None)
+    return normalize_dataframe(df)
+
+
+def _filter_conditions(
+    transaction_type: Optional[str],
+    status: Optional[str],
+    search: Optional[str]
+) -> Tuple[list, list]:
+    """Build the WHERE conditions and parameters shared by the filtered queries."""
+    conditions = []
+    params = []
+    if transaction_type:
+        conditions.append("transaction_type = %s")
+        params.append(transaction_type)
+    if status:
+        conditions.append("status = %s")
+        params.append(status)
+    if search:
+        # Escape LIKE wildcards so the search text matches literally
+        escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        conditions.append("item_name ILIKE %s")
+        params.append(f"%{escaped}%")
+    return conditions, params
+
+
+@st.cache_data(ttl=CONFIG.QUERY_CACHE_TTL, show_spinner=False)
+def _load_transaction_totals(
+    transaction_type: Optional[str] = None,
+    status: Optional[str] = None,
+    search: Optional[str] = None
+) -> dict:
+    """Aggregate transaction totals in SQL; cached across reruns until a write clears it."""
+    conditions, params = _filter_conditions(transaction_type, status, search)
+    query = '''
+        SELECT
+            -- SUM over REAL returns REAL; accumulate in float8 so totals don't drift
+            COALESCE(SUM(total_amount::float8) FILTER (WHERE transaction_type = 'BUY'), 0),
+            COALESCE(SUM(total_amount::float8) FILTER (WHERE transaction_type = 'SELL'), 0),
+            COUNT(*) FILTER (WHERE status = 'PENDING'),
+            COUNT(*)
+        FROM transactions
+    '''
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    with get_db_connection() as conn:
+        with conn.cursor() as c:
+            c.execute(query, tuple(params))
+            total_buy, total_sell, pending_count, total_transactions = c.fetchone()
+    return {
+        'total_buy': float(total_buy),
+        'total_sell': float(total_sell),
+        'pending_count': int(pending_count),
+        'total_transactions': int(total_transactions)
+    }
+
+
+@st.cache_data(ttl=CONFIG.QUERY_CACHE_TTL, show_spinner=False)
+def _load_recent_transactions(limit: int, columns: Tuple[str, ...]) -> pd.DataFrame:
+    """Query the newest transactions; cached across reruns until a write clears it."""
+    query = sql.SQL("SELECT {} FROM transactions ORDER BY id DESC LIMIT %s").format(
+        sql.SQL(", ").join(sql.Identifier(col) for col in columns)
+    )
+    parse_dates = ["transaction_date"] if "transaction_date" in columns else []
+    with get_db_connection() as conn:
+        df = fetch_dataframe(conn, query, (limit,), parse_dates=parse_dates)
+    # Arrow-backed columns go to st.dataframe without re-encoding object strings
+    return normalize_dataframe(df, compact=True).convert_dtypes(
+        convert_integer=False, dtype_backend="pyarrow"
+    )
+
+
+@st.cache_data(ttl=CONFIG.QUERY_CACHE_TTL, show_spinner=False)
+def _load_transaction_counts(column: str) -> pd.Series:
+    """Count transactions per value of a column; cached until a write clears it."""
+    query = sql.SQL("SELECT {0}, COUNT(*) FROM transactions GROUP BY {0} ORDER BY 2 DESC").format(
+        sql.Identifier(column)
+    )
+    with get_db_connection() as conn:
+        with conn.cursor() as c:
+            c.execute(query)
+            rows = c.fetchall()
+    return pd.Series(dict(rows), name="count", dtype="int64")
+
+
+@st.cache_data(ttl=CONFIG.QUERY_CACHE_TTL, show_spinner=False)
+def _load_pending_rows(columns: Tuple[str, ...]) -> list:
+    """Collect streamed pending rows; cached across reruns until a write clears it."""
+    return list(iter_pending_transactions(columns))
+
+
+@st.cache_data(ttl=CONFIG.QUERY_CACHE_TTL, show_spinner=False)
+def _load_filtered_transactions(
+    transaction_type: Optional[str],
+    status: Optional[str],
+    search: Optional[str],
+    before_id: Optional[int],
+    limit: Optional[int]
+) -> pd.DataFrame:
+    """Query transactions matching the filters; cached until a write clears it."""
+    conditions, params = _filter_conditions(transaction_type, status, search)
+    if before_id is not None:
+        conditions.append("id < %s")
+        params.append(before_id)
+    
+    query = "SELECT * FROM transactions"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY id DESC"
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(limit)
+    
+    with get_db_connection() as conn:
+        df = fetch_dataframe(conn, query, tuple(params), parse_dates=["transaction_date"])
+    return normalize_dataframe(df)
+
+
+@st.cache_data(ttl=CONFIG.QUERY_CACHE_TTL, show_spinner=False)
+def _load_transactions_csv(
+    transaction_type: Optional[str],
+    status: Optional[str],
+    search: Optional[str]
+) -> bytes:
+    """Encode the filtered transactions as CSV; cached until a write clears it."""
+    buffer = io.StringIO()
+    _load_filtered_transactions(transaction_type, status, search, None, None).to_csv(buffer, index=False)
+    return buffer.getvalue().encode("utf-8")
+
+
+@st.cache_data(ttl=CONFIG.QUERY_CACHE_TTL, show_spinner=False)
+def _load_database_size() -> int:
+    """Query the on-disk size of the current database; cached for the TTL only."""
+    with get_db_connection() as conn:
+        with conn.cursor() as c:
+            c.execute("SELECT pg_database_size(current_database())")
+            return int(c.fetchone()[0])
+
+
+def clear_transaction_cache() -> None:
+    """Invalidate cached transaction reads. Call after every committed write."""
+    _load_all_transactions.clear()
+    _load_pending_transactions.clear()
+    _load_transactions_projection.clear()
+    _load_transaction_totals.clear()
+    _load_recent_transactions.clear()
+    _load_transaction_counts.clear()
+    _load_pending_rows.clear()
+    _load_filtered_transactions.clear()
+    _load_transactions_csv.clear()
+
+
 def get_all_transactions() -> pd.DataFrame:
     """
     Retrieve all transactions from the database.
@@ -155,17 +631,191 @@ def get_all_transactions() -> pd.DataFrame:
         DataFrame containing all transactions, or empty DataFrame if error
     """
     try:
-        with get_db_connection() as conn:
-            df = pd.read_sql_query(
-                "SELECT * FROM transactions ORDER BY id DESC", 
-                conn
-            )
-            return normalize_dataframe(df)
+        return _load_all_transactions()
     except Exception as e:
         logger.error(f"Error retrieving all transactions: {e}")
         return pd.DataFrame()
 
 
+def get_transactions(
+    transaction_type: Optional[str] = None,
+    status: Optional[str] = None,
+    search: Optional[str] = None,
+    before_id: Optional[int] = None,
+    limit: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Retrieve transactions filtered in SQL, newest first.
+    
+    Args:
+        transaction_type: Only this type ('BUY' or 'SELL')
+        status: Only this status
+        search: Case-insensitive substring of item_name
+        before_id: Only rows with a smaller id (keyset pagination cursor)
+        limit: Maximum number of rows
+        
+    Returns:
+        DataFrame of matching transactions, or empty DataFrame if error
+    """
+    try:
+        return _load_filtered_transactions(transaction_type, status, search, before_id, limit)
+    except Exception as e:
+        logger.error(f"Error retrieving filtered transactions: {e}")
+        return pd.DataFrame()
+
+
+def get_transactions_csv(
+    transaction_type: Optional[str] = None,
+    status: Optional[str] = None,
+    search: Optional[str] = None
+) -> bytes:
+    """
+    Export the transactions matching the filters as UTF-8 CSV.
+    
+    The encoded bytes are cached per filter combination, so reruns that
+    don't change the filters don't serialize the table again.
+    
+    Args:
+        transaction_type: Only this type ('BUY' or 'SELL')
+        status: Only this status
+        search: Case-insensitive substring of item_name
+        
+    Returns:
+        CSV bytes, or empty bytes if error
+    """
+    try:
+        return _load_transactions_csv(transaction_type, status, search)
+    except Exception as e:
+        logger.error(f"Error exporting transactions: {e}")
+        return b""
+
+
+def get_transactions_projection(
+    columns: Tuple[str, ...],
+    where: str = "",
+    params: tuple = ()
+) -> pd.DataFrame:
+    """
+    Retrieve only the given columns, optionally filtered.
+    
+    Prefer this over get_all_transactions when a screen needs a few fields:
+    unused columns are never fetched or converted.
+    
+    Args:
+        columns: Column names to select
+        where: Optional SQL condition (without WHERE) using %s placeholders;
+            must be a fixed string, never built from user input
+        params: Parameters for the condition
+        
+    Returns:
+        DataFrame with the selected columns, or empty DataFrame if error
+    """
+    try:
+        return _load_transactions_projection(tuple(columns), where, tuple(params))
+    except Exception as e:
+        logger.error(f"Error retrieving transaction columns {columns}: {e}")
+        return pd.DataFrame(columns=list(columns))
+
+
+def get_transaction_totals(
+    transaction_type: Optional[str] = None,
+    status: Optional[str] = None,
+    search: Optional[str] = None
+) -> dict:
+    """
+    Retrieve buy/sell totals and counts with a single aggregate query.
+    
+    Args:
+        transaction_type: Only this type ('BUY' or 'SELL')
+        status: Only this status
+        search: Case-insensitive substring of item_name
+        
+    Returns:
+        Dictionary with total_buy, total_sell, pending_count and
+        total_transactions (all zero if error)
+    """
+    try:
+        return _load_transaction_totals(transaction_type, status, search)
+    except Exception as e:
+        logger.error(f"Error retrieving transaction totals: {e}")
+        return {
+            'total_buy': 0.0,
+            'total_sell': 0.0,
+            'pending_count': 0,
+            'total_transactions': 0
+        }
+
+
+def get_recent_transactions(
+    limit: int = 10,
+    columns: Sequence[str] = RECENT_TRANSACTION_COLUMNS
+) -> pd.DataFrame:
+    """
+    Retrieve the most recent transactions.
+    
+    Columns are downcast and Arrow-backed; the frame is meant for display only.
+    
+    Args:
+        limit: Maximum number of rows to return
+        columns: Column names to select, in display order
+        
+    Returns:
+        DataFrame of up to limit transactions, newest first, or empty DataFrame if error
+    """
+    try:
+        return _load_recent_transactions(limit, tuple(columns))
+    except Exception as e:
+        logger.error(f"Error retrieving recent transactions: {e}")
+        return pd.DataFrame()
+
+
+def get_transaction_counts(column: str) -> pd.Series:
+    """
+    Count transactions per distinct value of a column (e.g. status).
+    
+    Args:
+        column: Column to group by
+        
+    Returns:
+        Series of counts indexed by value, largest first, or empty Series if error
+    """
+    try:
+        return _load_transaction_counts(column)
+    except Exception as e:
+        logger.error(f"Error counting transactions by {column}: {e}")
+        return pd.Series(dtype="int64")
+
+
+def get_transaction_count() -> int:
+    """
+    Count all transactions.
+    
+    Served from the cached totals aggregate, so it costs no extra query
+    on pages that also show the summary.
+    
+    Returns:
+        Number of transactions (0 if error)
+    """
+    return get_transaction_totals()['total_transactions']
+
+
+def get_database_size() -> int:
+    """
+    Get the size of the database in bytes.
+    
+    Informational only, so writes don't invalidate it; it refreshes when
+    the cache TTL expires.
+    
+    Returns:
+        Size in bytes (0 if error)
+    """
+    try:
+        return _load_database_size()
+    except Exception as e:
+        logger.error(f"Error reading database size: {e}")
+        return 0
+
+
 def get_pending_transactions() -> pd.DataFrame:
     """
     Retrieve pending (bought but not sold) transactions.
@@ -174,17 +824,63 @@ def get_pending_transactions() -> pd.DataFrame:
         DataFrame containing pending transactions, or empty DataFrame if error
     """
     try:
-        with get_db_connection() as conn:
-            df = pd.read_sql_query(
-                "SELECT * FROM transactions WHERE status = 'PENDING' ORDER BY id DESC", 
-                conn
-            )
-            return normalize_dataframe(df)
+        return _load_pending_transactions()
     except Exception as e:
         logger.error(f"Error retrieving pending transactions: {e}")
         return pd.DataFrame()
 
 
+def iter_pending_transactions(
+    columns: Sequence[str] = ('id', 'item_name', 'quantity_kg'),
+    batch_size: int = 500
+) -> Iterator[tuple]:
+    """
+    Stream pending transactions as plain tuples, newest first.
+    
+    Uses a server-side cursor so only one batch is held in memory at a
+    time; for list views that don't need a DataFrame.
+    
+    Args:
+        columns: Column names to select, in tuple order
+        batch_size: Rows fetched per round trip
+        
+    Yields:
+        One tuple of column values per pending transaction
+    """
+    query = sql.SQL(
+        "SELECT {} FROM transactions WHERE status = 'PENDING' ORDER BY id DESC"
+    ).format(sql.SQL(", ").join(sql.Identifier(col) for col in columns))
+    with get_db_connection() as conn:
+        with conn.cursor(name="pending_stream") as c:
+            c.itersize = batch_size
+            c.execute(query)
+            while True:
+                rows = c.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+
+
+def get_pending_rows(columns: Sequence[str] = ('id', 'item_name', 'quantity_kg')) -> list:
+    """
+    Retrieve pending transactions as plain tuples, newest first.
+    
+    Cached version of iter_pending_transactions for widgets that are
+    rebuilt on every rerun.
+    
+    Args:
+        columns: Column names to select, in tuple order
+        
+    Returns:
+        List of tuples, or empty list if error
+    """
+    try:
+        return _load_pending_rows(tuple(columns))
+    except Exception as e:
+        logger.error(f"Error retrieving pending rows: {e}")
+        return []
+
+
 def get_transaction_by_id(transaction_id: int) -> pd.DataFrame:
     """
     Retrieve a specific transaction by ID.
@@ -197,10 +893,10 @@ def get_transaction_by_id(transaction_id: int) -> pd.DataFrame:
     """
     try:
         with get_db_connection() as conn:
-            df = pd.read_sql_query(
-                "SELECT * FROM transactions WHERE id = %s", 
-                conn, 
-                params=(transaction_id,)
+            df = fetch_dataframe(
+                conn,
+                "SELECT * FROM transactions WHERE id = %s",
+                (transaction_id,)
             )
             return normalize_dataframe(df)
     except Exception as e:
@@ -208,6 +904,58 @@ def get_transaction_by_id(transaction_id: int) -> pd.DataFrame:
         return pd.DataFrame()
 
 
+def _select_transaction_row(
+    cursor,
+    transaction_id: int,
+    columns: Sequence[str],
+    for_update: bool
+) -> Optional[dict]:
+    query = sql.SQL("SELECT {} FROM transactions WHERE id = %s").format(
+        sql.SQL(", ").join(sql.Identifier(col) for col in columns)
+    )
+    if for_update:
+        query = sql.SQL("{} FOR UPDATE").format(query)
+    cursor.execute(query, (transaction_id,))
+    row = cursor.fetchone()
+    return dict(zip(columns, row)) if row else None
+
+
+def get_transaction_fields(
+    transaction_id: int,
+    columns: Sequence[str],
+    conn=None,
+    for_update: bool = False
+) -> Optional[dict]:
+    """
+    Retrieve a few fields of one transaction as a plain dict.
+    
+    Much cheaper than get_transaction_by_id when the caller only needs
+    values, not a DataFrame for display.
+    
+    Args:
+        transaction_id: The ID of the transaction to retrieve
+        columns: Column names to select
+        conn: Optional open connection, so the read joins the caller's
+            transaction; errors are left to the caller in that case
+        for_update: Lock the row until the caller's transaction ends
+            (only meaningful with conn)
+        
+    Returns:
+        Dict of column values, or None if not found
+    """
+    if conn is not None:
+        with conn.cursor() as c:
+            return _select_transaction_row(c, transaction_id, columns, for_update)
+    
+    try:
+        with get_db_connection() as conn:
+            with conn.cursor() as c:
+                return _select_transaction_row(c, transaction_id, columns, False)
+    except Exception as e:
+        logger.error(f"Error retrieving transaction {transaction_id}: {e}")
+        return None
+
+
 def delete_transaction(transaction_id: int) -> bool:
     """
     Delete a transaction from the database.
@@ -223,6 +971,7 @@ def delete_transaction(transaction_id: int) -> bool:
             c = conn.cursor()
             c.execute('DELETE FROM transactions WHERE id = %s', (transaction_id,))
             conn.commit()
+            clear_transaction_cache()
             
             if c.rowcount > 0:
                 logger.info(f"Deleted transaction ID {transaction_id}")
@@ -254,6 +1003,7 @@ def add_party(name: str, phone: str = "", address: str = "", party_type: str = "
             result = c.fetchone()
             party_id = result[0] if result else None
             conn.commit()
+            clear_party_cache()
             logger.info(f"Added party ID {party_id}: {name}")
             return party_id
     except Exception as e:
@@ -261,18 +1011,30 @@ def add_party(name: str, phone: str = "", address: str = "", party_type: str = "
         return None
 
 
+@st.cache_data(ttl=CONFIG.QUERY_CACHE_TTL, show_spinner=False)
+def _load_parties(party_type: Optional[str]) -> pd.DataFrame:
+    """Query parties; cached across reruns until a party write clears it."""
+    with get_db_connection() as conn:
+        if party_type and party_type != "ALL":
+            df = fetch_dataframe(
+                conn,
+                "SELECT * FROM parties WHERE party_type = %s OR party_type = 'BOTH' ORDER BY name",
+                (party_type,)
+            )
+        else:
+            df = fetch_dataframe(conn, "SELECT * FROM parties ORDER BY name")
+    return normalize_dataframe(df)
+
+
+def clear_party_cache() -> None:
+    """Invalidate cached party reads. Call after every committed party write."""
+    _load_parties.clear()
+
+
 def get_all_parties(party_type: str = None) -> pd.DataFrame:
     """Get all parties, optionally filtered by type."""
     try:
-        with get_db_connection() as conn:
-            if party_type and party_type != "ALL":
-                df = pd.read_sql_query(
-                    "SELECT * FROM parties WHERE party_type = %s OR party_type = 'BOTH' ORDER BY name",
-                    conn, params=(party_type,)
-                )
-            else:
-                df = pd.read_sql_query("SELECT * FROM parties ORDER BY name", conn)
-            return normalize_dataframe(df)
+        return _load_parties(party_type)
     except Exception as e:
         logger.error(f"Error retrieving parties: {e}")
         return pd.DataFrame()
@@ -282,9 +1044,10 @@ def get_party_by_id(party_id: int) -> pd.DataFrame:
     """Get a party by ID."""
     try:
         with get_db_connection() as conn:
-            df = pd.read_sql_query(
+            df = fetch_dataframe(
+                conn,
                 "SELECT * FROM parties WHERE id = %s",
-                conn, params=(party_id,)
+                (party_id,)
             )
             return normalize_dataframe(df)
     except Exception as e:
@@ -299,7 +1062,16 @@ def delete_party(party_id: int) -> bool:
             c = conn.cursor()
             c.execute('DELETE FROM parties WHERE id = %s', (party_id,))
             conn.commit()
+            clear_party_cache()
             return c.rowcount > 0
     except Exception as e:
         logger.error(f"Error deleting party {party_id}: {e}")
         return False
+
+
+if __name__ == "__main__":
+    import sys
+    
+    if sys.argv[1:] == ["migrate-total-amount"]:
+        sys.exit(0 if migrate_total_amount() else 1)
+    sys.exit("usage: python database.py migrate-total-amount")
@@ -4,6 +4,7 @@ Logging configuration for the application.
 
 import logging
 import os
+from logging.handlers import RotatingFileHandler
 from datetime import datetime
 
 
@@ -19,12 +20,13 @@ def setup_logging() -> logging.Logger:
     
     # Create logs directory if it doesn't exist
     logs_dir = "logs"
-    if not os.path.exists(logs_dir):
-        os.makedirs(logs_dir)
+    os.makedirs(logs_dir, exist_ok=True)
     
-    # File handler
+    # File handler (size-capped so a long-running process can't fill the disk)
     log_file = os.path.join(logs_dir, f"app_{datetime.now().strftime('%Y%m%d')}.log")
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler = RotatingFileHandler(
+        log_file, maxBytes=5_000_000, backupCount=3, encoding='utf-8'
+    )
     file_handler.setLevel(logging.INFO)
     
     # Console handler
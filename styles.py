@@ -3,12 +3,11 @@ Custom CSS styles for the Buying & Selling Dashboard Application.
 Clean, professional design.
 """
 
+from typing import Sequence, Tuple
 import streamlit as st
 
 
-def inject_custom_css() -> None:
-    """Inject custom CSS styles into the Streamlit app."""
-    st.markdown("""
+_CUSTOM_CSS = """
     <style>
         /* Import Google Fonts */
         @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
@@ -157,4 +156,67 @@ def inject_custom_css() -> None:
             border-radius: 3px;
         }
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+
+def inject_custom_css() -> None:
+    """
+    Inject custom CSS styles into the Streamlit app.
+    
+    Streamlit drops elements that are not re-emitted on a rerun, so the
+    style block has to be sent every run; the string itself is built once
+    at import time.
+    """
+    st.markdown(_CUSTOM_CSS, unsafe_allow_html=True)
+
+
+_PAGE_HEADER_TEMPLATE = """
+<div style='background: linear-gradient(135deg, {start} 0%, {end} 100%); 
+            padding: 1.5rem; border-radius: 12px; margin-bottom: 2rem;'>
+    <h2 style='color: white; margin: 0; font-size: 1.8rem;'>{title}</h2>
+    <p style='color: rgba(255,255,255,0.9); margin: 0.5rem 0 0 0;'>{subtitle}</p>
+</div>
+"""
+
+
+def page_header_html(title: str, subtitle: str, start: str, end: str) -> str:
+    """
+    Build the gradient banner shown at the top of each page.
+    
+    Views call this once at import and keep the result as a module
+    constant.
+    
+    Args:
+        title: Heading text (may include an emoji)
+        subtitle: Line shown under the heading
+        start: Gradient start color
+        end: Gradient end color
+        
+    Returns:
+        HTML for st.markdown(..., unsafe_allow_html=True)
+    """
+    return _PAGE_HEADER_TEMPLATE.format(title=title, subtitle=subtitle, start=start, end=end)
+
+
+_BREAKDOWN_ITEM_TEMPLATE = "<div><b>{label}:</b> {value}</div>"
+
+
+def breakdown_grid_html(items: Sequence[Tuple[str, str]], rows: int = 2) -> str:
+    """
+    Build a label/value grid (filled column by column) as a single element.
+    
+    Args:
+        items: (label, formatted value) pairs
+        rows: Number of rows per column
+        
+    Returns:
+        HTML for st.markdown(..., unsafe_allow_html=True)
+    """
+    cells = "".join(
+        _BREAKDOWN_ITEM_TEMPLATE.format(label=label, value=value) for label, value in items
+    )
+    return (
+        "<div style='display: grid; grid-auto-flow: column; "
+        f"grid-template-rows: repeat({rows}, auto); gap: 0.5rem 1rem; margin-bottom: 1rem;'>"
+        f"{cells}</div>"
+    )
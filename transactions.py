@@ -3,20 +3,206 @@ Transaction operations for the Buying & Selling Dashboard Application.
 """
 
 import psycopg2
+from psycopg2.extras import execute_values
 import pandas as pd
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 import streamlit as st
 
 from config import CONFIG
-from database import get_db_connection, get_transaction_by_id
+from database import get_db_connection, get_transaction_fields, clear_transaction_cache
 from validators import (
-    validate_name, validate_item_name, validate_numeric_value, 
-    validate_notes, sanitize_string
+    validate_numeric_value, validate_fields, sanitize_string, sanitize_string_nocache,
+    validate_numeric_series, validate_text_series,
+    NAME_ALLOWED_PATTERN, ITEM_ALLOWED_PATTERN,
+    FIELD_NAME, FIELD_ITEM, FIELD_NUMERIC, FIELD_NOTES
 )
+from utils import display_error_message
 from logger_setup import logger
 
 
+# Column order shared by every INSERT into the transactions table
+# (total_amount is a generated column computed by the database)
+TRANSACTION_COLUMNS = (
+    'transaction_type', 'buyer_name', 'seller_name', 'item_name', 'quantity_kg',
+    'price_per_unit', 'base_amount', 'mandi_charge', 'tractor_rent', 'muddat',
+    'cash_discount', 'labour_charge', 'transport_charge',
+    'amount_paid', 'transaction_date', 'notes', 'status'
+)
+
+_INSERT_TRANSACTION_SQL = (
+    f"INSERT INTO transactions ({', '.join(TRANSACTION_COLUMNS)}) VALUES %s RETURNING id"
+)
+
+# Values used for columns a bulk row leaves out
+_ROW_DEFAULTS = {
+    'buyer_name': None,
+    'seller_name': None,
+    'mandi_charge': 0,
+    'tractor_rent': 0,
+    'muddat': 0,
+    'cash_discount': 0,
+    'labour_charge': 0,
+    'transport_charge': 0,
+    'amount_paid': 0,
+    'notes': '',
+    'status': 'PENDING',
+}
+
+
+# Validation specs for the single-row add functions, in argument order
+_BUY_SPEC = (
+    ("Buyer Name", FIELD_NAME, None, None),
+    ("Item Name", FIELD_ITEM, None, None),
+    ("Quantity", FIELD_NUMERIC, CONFIG.MIN_QUANTITY, CONFIG.MAX_QUANTITY),
+    ("Price per Unit", FIELD_NUMERIC, CONFIG.MIN_PRICE, CONFIG.MAX_PRICE),
+    ("Amount Paid", FIELD_NUMERIC, 0, CONFIG.MAX_AMOUNT),
+    ("Notes", FIELD_NOTES, None, None),
+)
+
+_SELL_SPEC = (
+    ("Seller Name", FIELD_NAME, None, None),
+    ("Item Name", FIELD_ITEM, None, None),
+    ("Quantity", FIELD_NUMERIC, CONFIG.MIN_QUANTITY, CONFIG.MAX_QUANTITY),
+    ("Price per Unit", FIELD_NUMERIC, CONFIG.MIN_PRICE, CONFIG.MAX_PRICE),
+    ("Amount Received", FIELD_NUMERIC, 0, CONFIG.MAX_AMOUNT),
+    ("Notes", FIELD_NOTES, None, None),
+)
+
+
+def _insert_rows(cursor, rows: List[tuple]) -> List[int]:
+    """Insert transaction rows with a single multi-row statement and return their IDs."""
+    result = execute_values(
+        cursor, _INSERT_TRANSACTION_SQL, rows,
+        page_size=CONFIG.DB_BATCH_PAGE_SIZE, fetch=True
+    )
+    return [row[0] for row in result]
+
+
+def bulk_insert_transactions(rows: List[Dict[str, Any]], conn=None) -> Optional[List[int]]:
+    """
+    Insert many transactions in one database transaction.
+    
+    Args:
+        rows: Transactions keyed by column name (see TRANSACTION_COLUMNS)
+        conn: Optional open connection; when given, the insert runs inside a
+            savepoint on the caller's transaction and is not committed here
+        
+    Returns:
+        List of new transaction IDs in input order, or None on failure
+    """
+    if not rows:
+        return []
+    
+    transaction_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    values = []
+    for row in rows:
+        merged = {**_ROW_DEFAULTS, 'transaction_date': transaction_date, **row}
+        values.append(tuple(merged.get(col) for col in TRANSACTION_COLUMNS))
+    
+    try:
+        if conn is not None:
+            c = conn.cursor()
+            c.execute('SAVEPOINT bulk_insert')
+            try:
+                ids = _insert_rows(c, values)
+            except psycopg2.Error:
+                c.execute('ROLLBACK TO SAVEPOINT bulk_insert')
+                raise
+            c.execute('RELEASE SAVEPOINT bulk_insert')
+            return ids
+        
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            ids = _insert_rows(c, values)
+            conn.commit()
+            clear_transaction_cache()
+            logger.info(f"Bulk inserted {len(ids)} transactions")
+            return ids
+            
+    except psycopg2.Error as e:
+        logger.error(f"Error bulk inserting transactions: {e}")
+        st.error(f"Database error: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"Unexpected error bulk inserting transactions: {e}")
+        st.error(f"An unexpected error occurred: {e}")
+        return None
+
+
+def add_transactions_batch(rows: List[Dict[str, Any]]) -> Optional[List[int]]:
+    """
+    Validate and insert many transactions with a single commit.
+
+    Each row needs transaction_type ('BUY' or 'SELL'), the matching
+    buyer_name/seller_name, item_name, quantity_kg and price_per_unit; other
+    columns fall back to the bulk defaults. base_amount is derived from
+    quantity and price when not supplied, and amount_paid may not exceed it.
+
+    Args:
+        rows: Transactions keyed by column name (see TRANSACTION_COLUMNS)
+
+    Returns:
+        List of new transaction IDs in input order, or None on failure
+    """
+    if not rows:
+        return []
+
+    df = pd.DataFrame(rows)
+    for col in ('transaction_type', 'buyer_name', 'seller_name', 'item_name',
+                'quantity_kg', 'price_per_unit', 'amount_paid', 'notes'):
+        if col not in df.columns:
+            df[col] = None
+
+    is_buy = df['transaction_type'] == 'BUY'
+    party = df['buyer_name'].where(is_buy, df['seller_name'])
+    # Coerced copies of the numeric inputs; these (not the raw values) are
+    # what gets inserted, so numeric strings such as "10" are stored as numbers
+    quantity = pd.to_numeric(df['quantity_kg'], errors="coerce")
+    price = pd.to_numeric(df['price_per_unit'], errors="coerce")
+    amount_paid = pd.to_numeric(df['amount_paid'].fillna(0), errors="coerce")
+    base_amount = quantity * price
+    if 'base_amount' in df.columns:
+        base_amount = pd.to_numeric(df['base_amount'], errors="coerce").fillna(base_amount)
+    checks = {
+        "Transaction Type": df['transaction_type'].isin(('BUY', 'SELL')),
+        "Name": validate_text_series(party, CONFIG.MAX_NAME_LENGTH, NAME_ALLOWED_PATTERN),
+        "Item Name": validate_text_series(
+            df['item_name'], CONFIG.MAX_ITEM_NAME_LENGTH, ITEM_ALLOWED_PATTERN
+        ),
+        "Quantity": validate_numeric_series(quantity, CONFIG.MIN_QUANTITY, CONFIG.MAX_QUANTITY),
+        "Price per Unit": validate_numeric_series(price, CONFIG.MIN_PRICE, CONFIG.MAX_PRICE),
+        "Base Amount": base_amount.between(0, CONFIG.MAX_AMOUNT),
+        # Same cap update_payment enforces later
+        "Amount Paid": (
+            validate_numeric_series(amount_paid, 0, CONFIG.MAX_AMOUNT) & (amount_paid <= base_amount)
+        ),
+        "Notes": df['notes'].fillna("").astype(str).str.len() <= CONFIG.MAX_NOTES_LENGTH,
+    }
+    for field_name, valid in checks.items():
+        if not valid.all():
+            bad_row = int((~valid).to_numpy().argmax())
+            display_error_message(f"Row {bad_row + 1}: invalid {field_name}")
+            return None
+
+    prepared = []
+    for row, qty, unit_price, base, paid in zip(
+        rows, quantity.tolist(), price.tolist(), base_amount.tolist(), amount_paid.tolist()
+    ):
+        row = dict(row, quantity_kg=qty, price_per_unit=unit_price,
+                   base_amount=base, amount_paid=paid)
+        for col in ('buyer_name', 'seller_name', 'item_name'):
+            if row.get(col):
+                row[col] = sanitize_string(row[col])
+        if row.get('notes'):
+            row['notes'] = sanitize_string_nocache(row['notes'])
+        if row['transaction_type'] == 'SELL':
+            row.setdefault('status', 'COMPLETED')
+        prepared.append(row)
+
+    return bulk_insert_transactions(prepared)
+
+
 def add_buying_transaction(
     buyer_name: str,
     item_name: str,
@@ -40,7 +226,8 @@ def add_buying_transaction(
         mandi_charge: Mandi charge amount
         tractor_rent: Tractor rent amount
         muddat: Muddat amount
-        total_amount: Total amount
+        total_amount: Total amount (used for validation; the stored value
+            is computed by the database from the charges)
         amount_paid: Amount already paid
         notes: Additional notes
         
@@ -49,71 +236,35 @@ def add_buying_transaction(
     """
     try:
         # Validate inputs
-        is_valid, error_msg = validate_name(buyer_name, "Buyer Name")
-        if not is_valid:
-            st.error(error_msg)
-            return None
-        
-        is_valid, error_msg = validate_item_name(item_name)
-        if not is_valid:
-            st.error(error_msg)
-            return None
-        
-        is_valid, error_msg = validate_numeric_value(
-            quantity_quintal, CONFIG.MIN_QUANTITY, CONFIG.MAX_QUANTITY, "Quantity"
-        )
-        if not is_valid:
-            st.error(error_msg)
-            return None
-        
-        is_valid, error_msg = validate_numeric_value(
-            price_per_unit, CONFIG.MIN_PRICE, CONFIG.MAX_PRICE, "Price per Unit"
-        )
-        if not is_valid:
-            st.error(error_msg)
-            return None
-        
-        is_valid, error_msg = validate_numeric_value(
-            amount_paid, 0, CONFIG.MAX_AMOUNT, "Amount Paid"
-        )
-        if not is_valid:
-            st.error(error_msg)
-            return None
-        
-        is_valid, error_msg = validate_notes(notes)
+        is_valid, error_msg = validate_fields(_BUY_SPEC, (
+            buyer_name, item_name, quantity_quintal, price_per_unit, amount_paid, notes
+        ))
         if not is_valid:
-            st.error(error_msg)
+            display_error_message(error_msg)
             return None
         
         # Sanitize inputs
         buyer_name = sanitize_string(buyer_name)
         item_name = sanitize_string(item_name)
-        notes = sanitize_string(notes)
+        notes = sanitize_string_nocache(notes)
         
         # Calculate base amount
         base_amount = price_per_unit * quantity_quintal
         transaction_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         if amount_paid > total_amount:
-            st.error("Amount Paid cannot exceed total amount")
+            display_error_message("Amount Paid cannot exceed total amount")
             return None
         
         with get_db_connection() as conn:
             c = conn.cursor()
-            c.execute('''INSERT INTO transactions 
-                         (transaction_type, buyer_name, seller_name, item_name, quantity_kg, 
-                          price_per_unit, base_amount, mandi_charge, tractor_rent, muddat, 
-                          cash_discount, labour_charge, transport_charge, total_amount, 
-                          amount_paid, transaction_date, notes, status)
-                         VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                         RETURNING id''',
-                      ('BUY', buyer_name, None, item_name, quantity_quintal, price_per_unit, 
-                       base_amount, mandi_charge, tractor_rent, muddat, 0, 0, 0,
-                       total_amount, amount_paid, transaction_date, notes, 'PENDING'))
-            
-            result = c.fetchone()
-            transaction_id = result[0] if result else None
+            transaction_id = _insert_rows(c, [
+                ('BUY', buyer_name, None, item_name, quantity_quintal, price_per_unit, 
+                 base_amount, mandi_charge, tractor_rent, muddat, 0, 0, 0,
+                 amount_paid, transaction_date, notes, 'PENDING')
+            ])[0]
             conn.commit()
+            clear_transaction_cache()
             logger.info(f"Added buying transaction ID {transaction_id} for buyer {buyer_name}")
             return transaction_id
             
@@ -151,7 +302,8 @@ def add_selling_transaction(
         cash_discount: Cash discount amount
         labour_charge: Labour charge amount
         transport_charge: Transport charge amount
-        total_amount: Total amount
+        total_amount: Total amount (used for validation; the stored value
+            is computed by the database from the charges)
         amount_paid: Amount already received
         buy_transaction_id: Optional linked buying transaction ID
         notes: Additional notes
@@ -161,98 +313,69 @@ def add_selling_transaction(
     """
     try:
         # Validate inputs
-        is_valid, error_msg = validate_name(seller_name, "Seller Name")
+        is_valid, error_msg = validate_fields(_SELL_SPEC, (
+            seller_name, item_name, quantity_quintal, price_per_unit, amount_paid, notes
+        ))
         if not is_valid:
-            st.error(error_msg)
-            return None
-        
-        is_valid, error_msg = validate_item_name(item_name)
-        if not is_valid:
-            st.error(error_msg)
-            return None
-        
-        is_valid, error_msg = validate_numeric_value(
-            quantity_quintal, CONFIG.MIN_QUANTITY, CONFIG.MAX_QUANTITY, "Quantity"
-        )
-        if not is_valid:
-            st.error(error_msg)
-            return None
-        
-        is_valid, error_msg = validate_numeric_value(
-            price_per_unit, CONFIG.MIN_PRICE, CONFIG.MAX_PRICE, "Price per Unit"
-        )
-        if not is_valid:
-            st.error(error_msg)
-            return None
-        
-        is_valid, error_msg = validate_numeric_value(
-            amount_paid, 0, CONFIG.MAX_AMOUNT, "Amount Received"
-        )
-        if not is_valid:
-            st.error(error_msg)
-            return None
-        
-        is_valid, error_msg = validate_notes(notes)
-        if not is_valid:
-            st.error(error_msg)
+            display_error_message(error_msg)
             return None
         
         # Sanitize inputs
         seller_name = sanitize_string(seller_name)
         item_name = sanitize_string(item_name)
-        notes = sanitize_string(notes)
+        notes = sanitize_string_nocache(notes)
         
         # Calculate base amount
         base_amount = price_per_unit * quantity_quintal
         transaction_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         if amount_paid > total_amount:
-            st.error("Amount Received cannot exceed total amount")
+            display_error_message("Amount Received cannot exceed total amount")
             return None
 
-        # Validate linked purchase
-        if buy_transaction_id:
-            linked = get_transaction_by_id(buy_transaction_id)
-            if linked.empty:
-                st.error("Linked purchase not found")
-                return None
-            linked_row = linked.iloc[0]
-            if linked_row.get("transaction_type") != "BUY" or linked_row.get("status") != "PENDING":
-                st.error("Linked purchase must be a pending BUY transaction")
-                return None
-            try:
-                linked_qty = float(linked_row.get("quantity_kg", 0))
-                if quantity_quintal > linked_qty:
-                    st.error("Selling quantity cannot exceed linked purchase quantity")
-                    return None
-            except (TypeError, ValueError):
-                st.error("Invalid quantity on linked purchase")
-                return None
-        
+        # Insert the sale and mark the linked purchase SOLD in one transaction
         with get_db_connection() as conn:
             c = conn.cursor()
-            c.execute('''INSERT INTO transactions 
-                         (transaction_type, buyer_name, seller_name, item_name, quantity_kg, 
-                          price_per_unit, base_amount, mandi_charge, tractor_rent, muddat, 
-                          cash_discount, labour_charge, transport_charge, total_amount, 
-                          amount_paid, transaction_date, notes, status)
-                         VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                         RETURNING id''',
-                      ('SELL', None, seller_name, item_name, quantity_quintal, price_per_unit, 
-                       base_amount, 0, 0, 0, cash_discount, labour_charge, transport_charge,
-                       total_amount, amount_paid, transaction_date, notes, 'COMPLETED'))
-            
-            result = c.fetchone()
-            transaction_id = result[0] if result else None
-            conn.commit()
+            try:
+                if buy_transaction_id:
+                    # Lock the purchase so two sales can't claim it at once
+                    linked = get_transaction_fields(
+                        buy_transaction_id, ('transaction_type', 'status', 'quantity_kg'),
+                        conn=conn, for_update=True
+                    )
+                    error_msg = None
+                    if linked is None:
+                        error_msg = "Linked purchase not found"
+                    elif linked['transaction_type'] != "BUY" or linked['status'] != "PENDING":
+                        error_msg = "Linked purchase must be a pending BUY transaction"
+                    elif linked['quantity_kg'] is None:
+                        error_msg = "Invalid quantity on linked purchase"
+                    elif quantity_quintal > linked['quantity_kg']:
+                        error_msg = "Selling quantity cannot exceed linked purchase quantity"
+                    if error_msg:
+                        conn.rollback()
+                        display_error_message(error_msg)
+                        return None
+                
+                transaction_id = _insert_rows(c, [
+                    ('SELL', None, seller_name, item_name, quantity_quintal, price_per_unit, 
+                     base_amount, 0, 0, 0, cash_discount, labour_charge, transport_charge,
+                     amount_paid, transaction_date, notes, 'COMPLETED')
+                ])[0]
+                
+                if buy_transaction_id:
+                    c.execute('''UPDATE transactions SET status = %s, updated_at = %s
+                                 WHERE id = %s''',
+                              ('SOLD', transaction_date, buy_transaction_id))
+                
+                conn.commit()
+            except psycopg2.Error:
+                conn.rollback()
+                raise
             
-            # If linked to a buying transaction, update its status
             if buy_transaction_id:
-                c.execute('UPDATE transactions SET status = %s, updated_at = %s WHERE id = %s',
-                         ('SOLD', datetime.now().strftime("%Y-%m-%d %H:%M:%S"), buy_transaction_id))
-                conn.commit()
                 logger.info(f"Linked selling transaction ID {transaction_id} to buying transaction ID {buy_transaction_id}")
-            
+            clear_transaction_cache()
             logger.info(f"Added selling transaction ID {transaction_id} for seller {seller_name}")
             return transaction_id
             
@@ -283,52 +406,48 @@ def update_payment(transaction_id: int, amount_paid: float) -> bool:
             amount_paid, 0, CONFIG.MAX_AMOUNT, "Amount Paid"
         )
         if not is_valid:
-            st.error(error_msg)
-            return False
-
-        # Fetch transaction to validate
-        transaction_df = get_transaction_by_id(transaction_id)
-        if transaction_df.empty:
-            st.error("Transaction not found")
-            return False
-        
-        row = transaction_df.iloc[0]
-        
-        # Calculate base_amount for validation (price × quantity)
-        # We use base_amount because ledger tracks base amounts, not total with expenses
-        price = pd.to_numeric(row.get("price_per_unit", 0), errors="coerce")
-        qty = pd.to_numeric(row.get("quantity_kg", 0), errors="coerce")
-        
-        if pd.isna(price) or pd.isna(qty):
-            # Fallback to total_amount if base values are missing
-            max_amount = pd.to_numeric(row.get("total_amount", 0), errors="coerce")
-        else:
-            max_amount = price * qty
-        
-        if pd.isna(max_amount):
-            st.error("Invalid amount for this transaction")
-            return False
-        
-        # Validate that amount_paid does not exceed max_amount
-        if amount_paid > max_amount:
-            st.error(f"Amount paid (₹{amount_paid:.2f}) cannot exceed base amount (₹{max_amount:.2f})")
+            display_error_message(error_msg)
             return False
 
+        # Validate and update in one statement. Payments are capped at the
+        # base amount (price x quantity) the ledger tracks, falling back to
+        # total_amount when either is missing. Returns no row if the
+        # transaction doesn't exist, and updated = false if the cap is hit.
         with get_db_connection() as conn:
             c = conn.cursor()
-            c.execute('''UPDATE transactions 
-                         SET amount_paid = %s, updated_at = %s 
-                         WHERE id = %s''',
-                     (amount_paid, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), transaction_id))
+            c.execute('''WITH target AS (
+                             SELECT id, COALESCE(price_per_unit * quantity_kg, total_amount) AS max_amount
+                             FROM transactions WHERE id = %s FOR UPDATE
+                         ), updated AS (
+                             UPDATE transactions t
+                             SET amount_paid = %s, updated_at = %s
+                             FROM target
+                             WHERE t.id = target.id AND %s <= target.max_amount
+                             RETURNING t.id
+                         )
+                         SELECT target.max_amount, EXISTS (SELECT 1 FROM updated)
+                         FROM target''',
+                      (transaction_id, amount_paid,
+                       datetime.now().strftime("%Y-%m-%d %H:%M:%S"), amount_paid))
+            result = c.fetchone()
             conn.commit()
             
-            if c.rowcount > 0:
-                logger.info(f"Updated payment for transaction ID {transaction_id} to ₹{amount_paid}")
-                return True
-            else:
+            if result is None:
                 logger.warning(f"Transaction ID {transaction_id} not found")
                 st.error("Transaction not found")
                 return False
+            
+            max_amount, updated = result
+            if max_amount is None:
+                display_error_message("Invalid amount for this transaction")
+                return False
+            if not updated:
+                display_error_message(f"Amount paid (₹{amount_paid:.2f}) cannot exceed base amount (₹{max_amount:.2f})")
+                return False
+            
+            clear_transaction_cache()
+            logger.info(f"Updated payment for transaction ID {transaction_id} to ₹{amount_paid}")
+            return True
                 
     except psycopg2.Error as e:
         logger.error(f"Error updating payment for transaction {transaction_id}: {e}")
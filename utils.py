@@ -2,13 +2,23 @@
 Utility functions for the Buying & Selling Dashboard Application.
 """
 
+from functools import lru_cache
 from typing import Dict, Any
 import pandas as pd
 import streamlit as st
 
+from database import get_transaction_totals
 from logger_setup import logger
 
 
+CURRENCY_SYMBOL = "\u20b9"  # Indian rupee sign
+
+
+@lru_cache(maxsize=2048)
+def _format_currency_cached(amount: float) -> str:
+    return f"{CURRENCY_SYMBOL}{amount:,.2f}"
+
+
 def format_currency(amount: float) -> str:
     """
     Format a number as Indian currency.
@@ -20,8 +30,9 @@ def format_currency(amount: float) -> str:
         Formatted currency string
     """
     if pd.isna(amount):
-        return "₹0.00"
-    return f"₹{amount:,.2f}"
+        return f"{CURRENCY_SYMBOL}0.00"
+    # Round first so near-identical floats share a cache entry
+    return _format_currency_cached(round(float(amount), 2))
 
 
 def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> float:
@@ -44,43 +55,18 @@ def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> f
         return default
 
 
-def get_transaction_summary(df: pd.DataFrame) -> Dict[str, Any]:
+def get_transaction_summary() -> Dict[str, Any]:
     """
-    Get a summary of transactions from a DataFrame.
+    Get a summary of all transactions.
+    
+    The totals are aggregated by the database, so no rows are loaded.
     
-    Args:
-        df: DataFrame containing transactions
-        
     Returns:
         Dictionary containing summary statistics
     """
-    if df.empty:
-        return {
-            'total_buy': 0.0,
-            'total_sell': 0.0,
-            'profit_loss': 0.0,
-            'pending_count': 0,
-            'total_transactions': 0
-        }
-    
-    df = df.copy()
-    if 'total_amount' in df.columns:
-        df['total_amount'] = pd.to_numeric(df['total_amount'], errors='coerce').fillna(0)
-    buy_df = df[df['transaction_type'] == 'BUY']
-    sell_df = df[df['transaction_type'] == 'SELL']
-    
-    total_buy = buy_df['total_amount'].sum() if not buy_df.empty else 0.0
-    total_sell = sell_df['total_amount'].sum() if not sell_df.empty else 0.0
-    profit_loss = total_sell - total_buy
-    pending_count = len(df[df['status'] == 'PENDING'])
-    
-    return {
-        'total_buy': total_buy,
-        'total_sell': total_sell,
-        'profit_loss': profit_loss,
-        'pending_count': pending_count,
-        'total_transactions': len(df)
-    }
+    summary = dict(get_transaction_totals())
+    summary['profit_loss'] = summary['total_sell'] - summary['total_buy']
+    return summary
 
 
 # =============================================================================
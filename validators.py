@@ -3,24 +3,29 @@ Input validation functions for the Buying & Selling Dashboard Application.
 """
 
 import re
-from typing import Optional, Tuple
+from functools import lru_cache
+from typing import Any, Optional, Sequence, Tuple
 import pandas as pd
 
 from config import CONFIG
 
 
-# Validation patterns
-NAME_ALLOWED_PATTERN = re.compile(r"^[\w .,'\&/()-]+$", re.UNICODE)
-ITEM_ALLOWED_PATTERN = re.compile(r"^[\w .,'\&/()-+%]+$", re.UNICODE)
+# Validation patterns (ASCII \w is a cheap table test; opt into Unicode via config)
+_NAME_PATTERN_FLAGS = re.UNICODE if CONFIG.ALLOW_UNICODE_NAMES else re.ASCII
+NAME_ALLOWED_PATTERN = re.compile(r"^[\w .,'\&/()-]+\Z", _NAME_PATTERN_FLAGS)
+ITEM_ALLOWED_PATTERN = re.compile(r"^[\w .,'\&/()-+%]+\Z", _NAME_PATTERN_FLAGS)
+_WHITESPACE_RE = re.compile(r"\s+")
+_STRIP_ANGLE_TABLE = str.maketrans("", "", "<>")
 
 
 def normalize_text(value: str) -> str:
     """Normalize text by trimming and collapsing whitespace."""
     if not value:
         return ""
-    return re.sub(r"\s+", " ", value).strip()
+    return _WHITESPACE_RE.sub(" ", value).strip()
 
 
+@lru_cache(maxsize=1024)
 def validate_text_field(
     value: str,
     field_name: str,
@@ -45,7 +50,7 @@ def validate_text_field(
     if len(value) > max_length:
         return False, f"{field_name} exceeds maximum length of {max_length} characters"
 
-    if re.search(r"[<>]", value):
+    if "<" in value or ">" in value:
         return False, f"{field_name} contains invalid characters"
 
     if pattern and not pattern.match(value):
@@ -54,12 +59,14 @@ def validate_text_field(
     return True, None
 
 
+@lru_cache(maxsize=1024)
 def validate_name(name: str, field_name: str = "Name") -> Tuple[bool, Optional[str]]:
     """Validate a person/organization name field."""
     name = normalize_text(name)
     return validate_text_field(name, field_name, CONFIG.MAX_NAME_LENGTH, NAME_ALLOWED_PATTERN)
 
 
+@lru_cache(maxsize=1024)
 def validate_item_name(name: str) -> Tuple[bool, Optional[str]]:
     """Validate an item name field."""
     name = normalize_text(name)
@@ -116,16 +123,54 @@ def validate_notes(notes: str) -> Tuple[bool, Optional[str]]:
         return False, f"Notes exceed maximum length of {CONFIG.MAX_NOTES_LENGTH} characters"
     
     # Disallow HTML/script injection characters
-    if re.search(r"[<>]", notes):
+    if "<" in notes or ">" in notes:
         return False, "Notes contain invalid characters"
     
     return True, None
 
 
-def sanitize_string(input_str: str) -> str:
+# Field kinds for validate_fields specs
+FIELD_NAME = "name"
+FIELD_ITEM = "item"
+FIELD_NUMERIC = "numeric"
+FIELD_NOTES = "notes"
+
+# Spec entry: (field_name, kind, min_val, max_val); bounds only apply to numerics
+FieldSpec = Tuple[Tuple[str, str, Optional[float], Optional[float]], ...]
+
+
+def validate_fields(spec: FieldSpec, values: Sequence[Any]) -> Tuple[bool, Optional[str]]:
+    """
+    Validate several fields against a spec built once at import time.
+    
+    Args:
+        spec: One (field_name, kind, min_val, max_val) entry per value
+        values: Values in the same order as spec
+        
+    Returns:
+        Tuple of (is_valid, error_message) for the first failing field
+    """
+    for (field_name, kind, min_val, max_val), value in zip(spec, values):
+        if kind == FIELD_NUMERIC:
+            is_valid, error_msg = validate_numeric_value(value, min_val, max_val, field_name)
+        elif kind == FIELD_NAME:
+            is_valid, error_msg = validate_name(value, field_name)
+        elif kind == FIELD_ITEM:
+            is_valid, error_msg = validate_item_name(value)
+        else:
+            is_valid, error_msg = validate_notes(value)
+        if not is_valid:
+            return False, error_msg
+    return True, None
+
+
+def sanitize_string_nocache(input_str: str) -> str:
     """
     Sanitize a string input by removing potentially harmful characters.
     
+    Use this for free text such as notes that rarely repeats; sanitize_string
+    is the memoized version for names and items.
+    
     Args:
         input_str: The string to sanitize
         
@@ -136,5 +181,62 @@ def sanitize_string(input_str: str) -> str:
         return ""
     
     # Remove potentially dangerous characters and normalize whitespace
-    sanitized = re.sub(r"[<>]", "", input_str)
+    sanitized = input_str.translate(_STRIP_ANGLE_TABLE)
     return normalize_text(sanitized)
+
+
+@lru_cache(maxsize=4096)
+def sanitize_string(input_str: str) -> str:
+    """Sanitize a frequently repeated string (names, items); see sanitize_string_nocache."""
+    return sanitize_string_nocache(input_str)
+
+
+# =============================================================================
+# BULK (DataFrame) VALIDATION
+# =============================================================================
+
+def validate_numeric_series(
+    values: pd.Series,
+    min_val: float,
+    max_val: float
+) -> pd.Series:
+    """
+    Vectorized counterpart of validate_numeric_value for bulk imports.
+    
+    Args:
+        values: Column of values to validate
+        min_val: Minimum allowed value
+        max_val: Maximum allowed value
+        
+    Returns:
+        Boolean Series, True where the value is a number within range
+    """
+    numeric = pd.to_numeric(values, errors="coerce")
+    return numeric.notna() & numeric.between(min_val, max_val)
+
+
+def validate_text_series(
+    values: pd.Series,
+    max_length: int,
+    pattern: Optional[re.Pattern] = None
+) -> pd.Series:
+    """
+    Vectorized counterpart of validate_text_field for bulk imports.
+    
+    Values are whitespace-normalized first, matching validate_name and
+    validate_item_name.
+    
+    Args:
+        values: Column of text values to validate
+        max_length: Maximum allowed length
+        pattern: Optional regex pattern to match
+        
+    Returns:
+        Boolean Series, True where the value is non-empty, within length,
+        free of angle brackets and matches the pattern
+    """
+    text = values.fillna("").astype(str).str.replace(_WHITESPACE_RE, " ", regex=True).str.strip()
+    valid = text.str.len().between(1, max_length) & ~text.str.contains("[<>]", regex=True)
+    if pattern is not None:
+        valid &= text.str.match(pattern.pattern, flags=pattern.flags)
+    return valid
@@ -1,24 +1,57 @@
 """
 Views package for the Buying & Selling Dashboard Application.
+
+Renderers are imported on first access, so loading one page doesn't pull
+in every other page's dependencies. Each renderer is wrapped as a
+Streamlit fragment, so interacting with a page's widgets reruns just that
+page instead of the whole script. A fragment rerun skips app.main(), so
+the wrapper carries the same error logging. The sidebar shows nothing a
+page changes, so it doesn't need the page's reruns.
 """
 
-from views.dashboard import render_dashboard
-from views.record_buying import render_record_buying
-from views.record_selling import render_record_selling
-from views.view_transactions import render_view_transactions
-from views.pending_inventory import render_pending_inventory
-from views.ledger import render_ledger
-from views.settings import render_settings
-from views.parties import render_parties
-
-__all__ = [
-    'render_dashboard',
-    'render_record_buying',
-    'render_record_selling',
-    'render_view_transactions',
-    'render_pending_inventory',
-    'render_ledger',
-    'render_settings',
-    'render_parties'
-]
+from functools import wraps
+from importlib import import_module
+import streamlit as st
+
+from logger_setup import logger
+
+# st.fragment (1.37+) or its experimental predecessor (1.33+); older
+# Streamlit releases fall back to plain full-script reruns
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+# Public renderer name -> submodule that defines it
+_RENDERER_MODULES = {
+    'render_dashboard': 'dashboard',
+    'render_record_buying': 'record_buying',
+    'render_record_selling': 'record_selling',
+    'render_view_transactions': 'view_transactions',
+    'render_pending_inventory': 'pending_inventory',
+    'render_ledger': 'ledger',
+    'render_settings': 'settings',
+    'render_parties': 'parties',
+}
+
+__all__ = list(_RENDERER_MODULES)
+
+
+def _as_page(renderer):
+    """Wrap a renderer with app.main()'s error handling, as a fragment if available."""
+    @wraps(renderer)
+    def page(*args, **kwargs):
+        try:
+            return renderer(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Application error: {e}")
+            st.error(f"An unexpected error occurred: {e}")
+    
+    return _fragment(page) if _fragment is not None else page
+
 
+def __getattr__(name):
+    module_name = _RENDERER_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    renderer = getattr(import_module(f"{__name__}.{module_name}"), name)
+    renderer = _as_page(renderer)
+    globals()[name] = renderer
+    return renderer
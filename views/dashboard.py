@@ -5,7 +5,7 @@ Dashboard page for the Buying & Selling Dashboard Application.
 import streamlit as st
 import pandas as pd
 
-from database import get_all_transactions
+from database import get_recent_transactions, get_transaction_counts
 from utils import format_currency, get_transaction_summary, display_error_message
 from logger_setup import logger
 
@@ -16,10 +16,9 @@ def render_dashboard() -> None:
     st.caption("Monitor your business performance at a glance")
     
     try:
-        df = get_all_transactions()
+        summary = get_transaction_summary()
         
-        if not df.empty:
-            summary = get_transaction_summary(df)
+        if summary['total_transactions'] > 0:
             
             # Key Metrics
             col1, col2, col3, col4 = st.columns(4)
@@ -58,13 +57,13 @@ def render_dashboard() -> None:
             
             with col_chart1:
                 st.subheader("Transaction Types")
-                transaction_counts = df['transaction_type'].value_counts()
+                transaction_counts = get_transaction_counts('transaction_type')
                 if not transaction_counts.empty:
                     st.bar_chart(transaction_counts, color="#3b82f6")
             
             with col_chart2:
                 st.subheader("Status Distribution")
-                status_counts = df['status'].value_counts()
+                status_counts = get_transaction_counts('status')
                 if not status_counts.empty:
                     st.bar_chart(status_counts, color="#10b981")
             
@@ -73,13 +72,8 @@ def render_dashboard() -> None:
             # Recent Transactions
             st.subheader("🕐 Recent Transactions")
             
-            recent_df = df.head(10).copy()
-            display_columns = ['id', 'transaction_type', 'item_name', 'quantity_kg', 
-                             'total_amount', 'transaction_date', 'status']
-            available_columns = [col for col in display_columns if col in recent_df.columns]
-            
             st.dataframe(
-                recent_df[available_columns],
+                get_recent_transactions(10),
                 use_container_width=True,
                 hide_index=True,
                 column_config={
@@ -4,6 +4,7 @@ Shows buyer/seller payment status using BASE AMOUNT (price × quantity).
 Extra charges are YOUR expenses, not buyer's/seller's.
 """
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
@@ -26,6 +27,8 @@ def render_ledger() -> None:
             # Ensure base_amount column exists
             if 'base_amount' not in df.columns:
                 df['base_amount'] = df['price_per_unit'] * df['quantity_kg']
+            # Index by transaction id so the payment forms can look rows up directly
+            df.index = df['id'].to_numpy()
             
             tab1, tab2, tab3 = st.tabs(["👤 Buyers (You Pay)", "🏪 Sellers (They Pay You)", "📊 Summary"])
             
@@ -45,20 +48,61 @@ def render_ledger() -> None:
         display_error_message(f"Error loading ledger: {e}")
 
 
+def build_party_ledger(
+    party_df: pd.DataFrame,
+    name_col: str,
+    party_label: str,
+    paid_label: str
+) -> pd.DataFrame:
+    """
+    Summarize base amount, payments and balance per party in one groupby.
+    
+    Args:
+        party_df: Transactions of one type with base_amount and amount_paid
+        name_col: Column holding the party name
+        party_label: Output column name for the party
+        paid_label: Output column name for the amount paid/received
+        
+    Returns:
+        One row per party, in order of first appearance
+    """
+    named = party_df[party_df[name_col].fillna('') != '']
+    ledger_df = named.groupby(name_col, sort=False).agg(
+        base_amount=('base_amount', 'sum'),
+        paid=('amount_paid', 'sum'),
+        transactions=('id', 'size')
+    )
+    balance = ledger_df['base_amount'] - ledger_df['paid']
+    return pd.DataFrame({
+        party_label: ledger_df.index,
+        'Base Amount': ledger_df['base_amount'].to_numpy(),
+        paid_label: ledger_df['paid'].to_numpy(),
+        'Balance': balance.to_numpy(),
+        'Transactions': ledger_df['transactions'].to_numpy(),
+        'Status': np.where(balance.to_numpy() <= 0.01, '✅ Cleared', '⏳ Pending')
+    })
+
+
+def transaction_options(party_transactions: pd.DataFrame) -> dict:
+    """Map 'ID n - item (q Q)' labels to transaction ids, built column-wise."""
+    ids = party_transactions['id'].astype(int)
+    labels = (
+        'ID ' + ids.astype(str) + ' - ' + party_transactions['item_name'].astype(str)
+        + ' (' + party_transactions['quantity_kg'].map('{:.1f}'.format) + ' Q)'
+    )
+    return dict(zip(labels.tolist(), ids.tolist()))
+
+
 def render_buyer_ledger(df: pd.DataFrame) -> None:
-    """Render the buyer ledger tab."""
+    """Render the buyer ledger tab. df must have base_amount and be indexed by id."""
     st.info("💡 **Note:** This shows BASE amount (Price × Quantity). Your expenses (Mandi, Tractor, Muddat) are NOT included.")
     
-    buyer_df = df[df['transaction_type'] == 'BUY'].copy()
+    buyer_df = df.loc[df['transaction_type'] == 'BUY']
     
     if buyer_df.empty:
         st.warning("No buyer transactions found.")
         return
     
-    # Calculate base_amount if needed
-    if 'base_amount' not in buyer_df.columns:
-        buyer_df['base_amount'] = buyer_df['price_per_unit'] * buyer_df['quantity_kg']
-    
     buyers = buyer_df['buyer_name'].dropna().unique()
     buyers = [b for b in buyers if b and b != '']
     
@@ -67,23 +111,7 @@ def render_buyer_ledger(df: pd.DataFrame) -> None:
         return
     
     # Create ledger summary
-    buyer_ledger = []
-    for buyer in buyers:
-        buyer_trans = buyer_df[buyer_df['buyer_name'] == buyer]
-        total_base = buyer_trans['base_amount'].sum()
-        total_paid = buyer_trans['amount_paid'].sum()
-        balance = total_base - total_paid
-        
-        buyer_ledger.append({
-            'Buyer': buyer,
-            'Base Amount': total_base,
-            'Paid': total_paid,
-            'Balance': balance,
-            'Transactions': len(buyer_trans),
-            'Status': '✅ Cleared' if balance <= 0.01 else '⏳ Pending'
-        })
-    
-    ledger_df = pd.DataFrame(buyer_ledger)
+    ledger_df = build_party_ledger(buyer_df, 'buyer_name', 'Buyer', 'Paid')
     st.dataframe(
         ledger_df,
         use_container_width=True,
@@ -97,14 +125,14 @@ def render_buyer_ledger(df: pd.DataFrame) -> None:
     
     # Summary metrics
     st.divider()
+    total_base, total_paid = buyer_df[['base_amount', 'amount_paid']].sum()
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Total Base Amount", format_currency(buyer_df['base_amount'].sum()))
+        st.metric("Total Base Amount", format_currency(total_base))
     with col2:
-        st.metric("Total Paid", format_currency(buyer_df['amount_paid'].sum()))
+        st.metric("Total Paid", format_currency(total_paid))
     with col3:
-        balance = buyer_df['base_amount'].sum() - buyer_df['amount_paid'].sum()
-        st.metric("Balance Due", format_currency(balance))
+        st.metric("Balance Due", format_currency(total_base - total_paid))
     
     # Update payment section
     st.divider()
@@ -118,10 +146,7 @@ def render_buyer_ledger(df: pd.DataFrame) -> None:
     
     with col2:
         buyer_transactions = buyer_df[buyer_df['buyer_name'] == selected_buyer]
-        trans_options = {
-            f"ID {int(row['id'])} - {row['item_name']} ({row['quantity_kg']:.1f} Q)": int(row['id'])
-            for _, row in buyer_transactions.iterrows()
-        }
+        trans_options = transaction_options(buyer_transactions)
         
         if not trans_options:
             st.warning("No transactions for this buyer")
@@ -131,9 +156,8 @@ def render_buyer_ledger(df: pd.DataFrame) -> None:
         trans_id = trans_options[selected_label]
     
     # Get current values
-    trans_row = buyer_transactions[buyer_transactions['id'] == trans_id].iloc[0]
-    trans_base = float(trans_row['base_amount'])
-    current_paid = float(trans_row['amount_paid'])
+    trans_base = float(buyer_transactions.at[trans_id, 'base_amount'])
+    current_paid = float(buyer_transactions.at[trans_id, 'amount_paid'])
     remaining = trans_base - current_paid
     
     st.info(f"**Base Amount:** {format_currency(trans_base)} | **Paid:** {format_currency(current_paid)} | **Remaining:** {format_currency(remaining)}")
@@ -170,47 +194,24 @@ def render_buyer_ledger(df: pd.DataFrame) -> None:
 
 
 def render_seller_ledger(df: pd.DataFrame) -> None:
-    """Render the seller ledger tab."""
+    """Render the seller ledger tab. df must have base_amount and be indexed by id."""
     st.info("💡 **Note:** This shows BASE amount (Price × Quantity). Your deductions (Discount, Labour, Transport) are NOT included.")
     
-    seller_df = df[df['transaction_type'] == 'SELL'].copy()
-    seller_df = seller_df[seller_df['seller_name'].notna()]
-    seller_df = seller_df[seller_df['seller_name'] != '']
-    seller_df = seller_df[seller_df['seller_name'] != 'None']
+    is_named_sale = (
+        (df['transaction_type'] == 'SELL')
+        & df['seller_name'].notna()
+        & ~df['seller_name'].isin(['', 'None'])
+    )
+    seller_df = df.loc[is_named_sale]
     
     if seller_df.empty:
         st.warning("No seller transactions found.")
         return
     
-    # Calculate base_amount if needed
-    if 'base_amount' not in seller_df.columns:
-        seller_df['base_amount'] = seller_df['price_per_unit'] * seller_df['quantity_kg']
-    
-    sellers = seller_df['seller_name'].dropna().unique()
-    sellers = [s for s in sellers if s and s != '' and s != 'None']
-    
-    if not sellers:
-        st.warning("No sellers found in transactions.")
-        return
+    sellers = seller_df['seller_name'].unique()
     
     # Create ledger summary
-    seller_ledger = []
-    for seller in sellers:
-        seller_trans = seller_df[seller_df['seller_name'] == seller]
-        total_base = seller_trans['base_amount'].sum()
-        total_received = seller_trans['amount_paid'].sum()
-        balance = total_base - total_received
-        
-        seller_ledger.append({
-            'Seller': seller,
-            'Base Amount': total_base,
-            'Received': total_received,
-            'Balance': balance,
-            'Transactions': len(seller_trans),
-            'Status': '✅ Cleared' if balance <= 0.01 else '⏳ Pending'
-        })
-    
-    ledger_df = pd.DataFrame(seller_ledger)
+    ledger_df = build_party_ledger(seller_df, 'seller_name', 'Seller', 'Received')
     st.dataframe(
         ledger_df,
         use_container_width=True,
@@ -224,14 +225,14 @@ def render_seller_ledger(df: pd.DataFrame) -> None:
     
     # Summary metrics
     st.divider()
+    total_base, total_paid = seller_df[['base_amount', 'amount_paid']].sum()
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Total Base Amount", format_currency(seller_df['base_amount'].sum()))
+        st.metric("Total Base Amount", format_currency(total_base))
     with col2:
-        st.metric("Total Received", format_currency(seller_df['amount_paid'].sum()))
+        st.metric("Total Received", format_currency(total_paid))
     with col3:
-        balance = seller_df['base_amount'].sum() - seller_df['amount_paid'].sum()
-        st.metric("Balance Receivable", format_currency(balance))
+        st.metric("Balance Receivable", format_currency(total_base - total_paid))
     
     # Update payment section
     st.divider()
@@ -245,10 +246,7 @@ def render_seller_ledger(df: pd.DataFrame) -> None:
     
     with col2:
         seller_transactions = seller_df[seller_df['seller_name'] == selected_seller]
-        trans_options = {
-            f"ID {int(row['id'])} - {row['item_name']} ({row['quantity_kg']:.1f} Q)": int(row['id'])
-            for _, row in seller_transactions.iterrows()
-        }
+        trans_options = transaction_options(seller_transactions)
         
         if not trans_options:
             st.warning("No transactions for this seller")
@@ -258,9 +256,8 @@ def render_seller_ledger(df: pd.DataFrame) -> None:
         trans_id = trans_options[selected_label]
     
     # Get current values
-    trans_row = seller_transactions[seller_transactions['id'] == trans_id].iloc[0]
-    trans_base = float(trans_row['base_amount'])
-    current_received = float(trans_row['amount_paid'])
+    trans_base = float(seller_transactions.at[trans_id, 'base_amount'])
+    current_received = float(seller_transactions.at[trans_id, 'amount_paid'])
     remaining = trans_base - current_received
     
     st.info(f"**Base Amount:** {format_currency(trans_base)} | **Received:** {format_currency(current_received)} | **Remaining:** {format_currency(remaining)}")
@@ -300,10 +297,6 @@ def render_ledger_summary(df: pd.DataFrame) -> None:
     """Render overall ledger summary with expenses breakdown."""
     st.subheader("📊 Overall Summary")
     
-    # Calculate base amounts
-    if 'base_amount' not in df.columns:
-        df['base_amount'] = df['price_per_unit'] * df['quantity_kg']
-    
     buy_df = df[df['transaction_type'] == 'BUY']
     sell_df = df[df['transaction_type'] == 'SELL']
     
@@ -72,12 +72,19 @@ def render_parties():
             st.markdown("---")
             st.subheader("🗑️ Delete Contact")
             
-            party_options = [f"{row['id']} - {row['name']} ({row.get('phone', 'No phone')})" 
-                           for _, row in parties_df.iterrows()]
+            party_labels = {
+                int(party_id): f"{party_id} - {name} ({phone})"
+                for party_id, name, phone in zip(
+                    parties_df['id'].to_numpy(),
+                    parties_df['name'].to_numpy(),
+                    parties_df['phone'].to_numpy()
+                )
+            }
             
-            if party_options:
-                selected = st.selectbox("Select contact to delete", party_options)
-                party_id_to_delete = int(selected.split(" - ")[0])
+            if party_labels:
+                party_id_to_delete = st.selectbox(
+                    "Select contact to delete", options=list(party_labels), format_func=party_labels.get
+                )
                 
                 if st.button("🗑️ Delete Selected Contact", type="secondary"):
                     if delete_party(party_id_to_delete):
@@ -8,29 +8,38 @@ from config import CONFIG
 from calculations import calculate_buying_price
 from transactions import add_buying_transaction
 from database import get_all_parties, add_party
+from styles import page_header_html, breakdown_grid_html
 from utils import format_currency, display_error_message
 
 
+_HEADER_HTML = page_header_html(
+    "📥 Record Buying Transaction",
+    "Add new purchase transactions to your inventory",
+    "#667eea", "#764ba2"
+)
+
+
+# Cost breakdown labels; the rates are fixed, so these are built once
+_BREAKDOWN_LABELS = (
+    "Base Price",
+    f"Mandi Charge ({CONFIG.MANDI_CHARGE_RATE*100}%)",
+    f"Tractor Rent (₹{CONFIG.TRACTOR_RENT_PER_QUINTAL}/Q)",
+    f"Muddat ({CONFIG.MUDDAT_RATE*100}%)",
+)
+
+
 def render_record_buying() -> None:
     """Render the record buying transaction page."""
-    st.markdown("""
-    <div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                padding: 1.5rem; border-radius: 12px; margin-bottom: 2rem;'>
-        <h2 style='color: white; margin: 0; font-size: 1.8rem;'>
-            📥 Record Buying Transaction
-        </h2>
-        <p style='color: rgba(255,255,255,0.9); margin: 0.5rem 0 0 0;'>
-            Add new purchase transactions to your inventory
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
     
     # Get existing parties for dropdown
     parties_df = get_all_parties("BUYER")
-    party_options = ["➕ Add New Buyer..."]
-    if not parties_df.empty:
-        party_options += [f"{row['id']} - {row['name']} ({row.get('phone', '') or 'No phone'})" 
-                         for _, row in parties_df.iterrows()]
+    # Option label -> (party id, name), so a selection needs no parsing
+    party_choices = {
+        f"{party_id} - {name} ({phone or 'No phone'})": (int(party_id), name)
+        for party_id, name, phone in zip(parties_df['id'], parties_df['name'], parties_df['phone'])
+    } if not parties_df.empty else {}
+    party_options = ["➕ Add New Buyer...", *party_choices]
     
     # Party selection outside form for dynamic updates
     selected_party = st.selectbox("Select Buyer *", party_options, key="buy_party_select")
@@ -47,8 +56,7 @@ def render_record_buying() -> None:
         with col_new2:
             new_buyer_phone = st.text_input("Phone (optional)", placeholder="e.g., 9876543210", key="new_buyer_phone")
     else:
-        party_id = int(selected_party.split(" - ")[0])
-        buyer_name = selected_party.split(" - ")[1].split(" (")[0]
+        party_id, buyer_name = party_choices[selected_party]
     
     with st.form("buying_form"):
         col1, col2, col3 = st.columns(3)
@@ -56,6 +64,7 @@ def render_record_buying() -> None:
         with col1:
             item_name = st.text_input(
                 "Item Name *",
+                key="buy_item_name",
                 placeholder="e.g., Rice, Wheat",
                 max_chars=CONFIG.MAX_ITEM_NAME_LENGTH
             )
@@ -63,6 +72,7 @@ def render_record_buying() -> None:
         with col2:
             quantity_quintal = st.number_input(
                 "Quantity (Quintal) *",
+                key="buy_quantity",
                 min_value=CONFIG.MIN_QUANTITY,
                 max_value=CONFIG.MAX_QUANTITY,
                 value=1.0,
@@ -72,6 +82,7 @@ def render_record_buying() -> None:
             
             price_per_unit = st.number_input(
                 "Price per Quintal (₹) *",
+                key="buy_price",
                 min_value=CONFIG.MIN_PRICE,
                 max_value=CONFIG.MAX_PRICE,
                 value=1000.0,
@@ -82,6 +93,7 @@ def render_record_buying() -> None:
         with col3:
             amount_paid = st.number_input(
                 "Amount Paid (₹)",
+                key="buy_amount_paid",
                 min_value=0.0,
                 max_value=CONFIG.MAX_AMOUNT,
                 value=0.0,
@@ -91,6 +103,7 @@ def render_record_buying() -> None:
             
             notes = st.text_area(
                 "Notes (Optional)",
+                key="buy_notes",
                 placeholder="Any additional notes",
                 max_chars=CONFIG.MAX_NOTES_LENGTH
             )
@@ -128,13 +141,11 @@ def render_record_buying() -> None:
                         
                         # Show breakdown
                         with st.expander("💰 Cost Breakdown", expanded=True):
-                            col_b1, col_b2 = st.columns(2)
-                            with col_b1:
-                                st.write(f"**Base Price:** {format_currency(base_amount)}")
-                                st.write(f"**Mandi Charge ({CONFIG.MANDI_CHARGE_RATE*100}%):** {format_currency(mandi_charge)}")
-                            with col_b2:
-                                st.write(f"**Tractor Rent (₹{CONFIG.TRACTOR_RENT_PER_QUINTAL}/Q):** {format_currency(tractor_rent)}")
-                                st.write(f"**Muddat ({CONFIG.MUDDAT_RATE*100}%):** {format_currency(muddat)}")
+                            amounts = map(format_currency, (base_amount, mandi_charge, tractor_rent, muddat))
+                            st.markdown(
+                                breakdown_grid_html(list(zip(_BREAKDOWN_LABELS, amounts))),
+                                unsafe_allow_html=True
+                            )
                             st.markdown(f"### Total: {format_currency(total_amount)}")
                 except ValueError as e:
                     display_error_message(f"Calculation error: {e}")
@@ -5,36 +5,42 @@ Record Selling page for the Buying & Selling Dashboard Application.
 import streamlit as st
 
 from config import CONFIG
-from database import get_pending_transactions, get_all_parties, add_party
+from database import get_pending_rows, get_all_parties, add_party
 from calculations import calculate_selling_price
 from transactions import add_selling_transaction
+from styles import page_header_html, breakdown_grid_html
 from utils import format_currency, display_error_message
 
 
+_HEADER_HTML = page_header_html(
+    "📤 Record Selling Transaction",
+    "Record sales and link them to your inventory",
+    "#48bb78", "#38a169"
+)
+
+
+# Revenue breakdown labels; the rates are fixed, so these are built once
+_BREAKDOWN_LABELS = (
+    "Base Price",
+    f"Cash Discount ({CONFIG.CASH_DISCOUNT_RATE*100}%)",
+    f"Labour (₹{CONFIG.LABOUR_CHARGE_PER_QUINTAL}/Q)",
+    f"Transport (₹{CONFIG.TRANSPORT_CHARGE_PER_QUINTAL}/Q)",
+)
+
+
 def render_record_selling() -> None:
     """Render the record selling transaction page."""
-    st.markdown("""
-    <div style='background: linear-gradient(135deg, #48bb78 0%, #38a169 100%); 
-                padding: 1.5rem; border-radius: 12px; margin-bottom: 2rem;'>
-        <h2 style='color: white; margin: 0; font-size: 1.8rem;'>
-            📤 Record Selling Transaction
-        </h2>
-        <p style='color: rgba(255,255,255,0.9); margin: 0.5rem 0 0 0;'>
-            Record sales and link them to your inventory
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
     
     # Option to link with pending buying transaction
-    pending_df = get_pending_transactions()
+    purchase_options = {
+        f"ID {tx_id} - {item_name} ({quantity} Quintal)": tx_id
+        for tx_id, item_name, quantity in get_pending_rows()
+    }
     link_purchase = None
     
-    if not pending_df.empty:
+    if purchase_options:
         st.subheader("🔗 Link with Previous Purchase (Optional)")
-        purchase_options = {
-            f"ID {row['id']} - {row['item_name']} ({row['quantity_kg']} Quintal)": row['id']
-            for _, row in pending_df.iterrows()
-        }
         selected_purchase = st.selectbox(
             "Select pending purchase",
             options=[None] + list(purchase_options.keys()),
@@ -49,10 +55,12 @@ def render_record_selling() -> None:
     
     # Get existing parties for dropdown
     parties_df = get_all_parties("SELLER")
-    party_options = ["➕ Add New Seller..."]
-    if not parties_df.empty:
-        party_options += [f"{row['id']} - {row['name']} ({row.get('phone', '') or 'No phone'})" 
-                         for _, row in parties_df.iterrows()]
+    # Option label -> (party id, name), so a selection needs no parsing
+    party_choices = {
+        f"{party_id} - {name} ({phone or 'No phone'})": (int(party_id), name)
+        for party_id, name, phone in zip(parties_df['id'], parties_df['name'], parties_df['phone'])
+    } if not parties_df.empty else {}
+    party_options = ["➕ Add New Seller...", *party_choices]
     
     # Party selection outside form for dynamic updates
     selected_party = st.selectbox("Select Seller *", party_options, key="sell_party_select")
@@ -69,8 +77,7 @@ def render_record_selling() -> None:
         with col_new2:
             new_seller_phone = st.text_input("Phone (optional)", placeholder="e.g., 9876543210", key="new_seller_phone")
     else:
-        party_id = int(selected_party.split(" - ")[0])
-        seller_name = selected_party.split(" - ")[1].split(" (")[0]
+        party_id, seller_name = party_choices[selected_party]
     
     with st.form("selling_form"):
         col1, col2, col3 = st.columns(3)
@@ -78,6 +85,7 @@ def render_record_selling() -> None:
         with col1:
             item_name = st.text_input(
                 "Item Name *",
+                key="sell_item_name",
                 placeholder="e.g., Rice, Wheat",
                 max_chars=CONFIG.MAX_ITEM_NAME_LENGTH
             )
@@ -85,6 +93,7 @@ def render_record_selling() -> None:
         with col2:
             quantity_quintal = st.number_input(
                 "Quantity (Quintal) *",
+                key="sell_quantity",
                 min_value=CONFIG.MIN_QUANTITY,
                 max_value=CONFIG.MAX_QUANTITY,
                 value=1.0,
@@ -94,6 +103,7 @@ def render_record_selling() -> None:
             
             price_per_unit = st.number_input(
                 "Selling Price per Quintal (₹) *",
+                key="sell_price",
                 min_value=CONFIG.MIN_PRICE,
                 max_value=CONFIG.MAX_PRICE,
                 value=1200.0,
@@ -104,6 +114,7 @@ def render_record_selling() -> None:
         with col3:
             amount_paid = st.number_input(
                 "Amount Received (₹)",
+                key="sell_amount_paid",
                 min_value=0.0,
                 max_value=CONFIG.MAX_AMOUNT,
                 value=0.0,
@@ -113,6 +124,7 @@ def render_record_selling() -> None:
             
             notes = st.text_area(
                 "Notes (Optional)",
+                key="sell_notes",
                 placeholder="Any additional notes",
                 max_chars=CONFIG.MAX_NOTES_LENGTH
             )
@@ -150,13 +162,14 @@ def render_record_selling() -> None:
                         
                         # Show breakdown
                         with st.expander("💰 Revenue Breakdown", expanded=True):
-                            col_s1, col_s2 = st.columns(2)
-                            with col_s1:
-                                st.write(f"**Base Price:** {format_currency(base_amount)}")
-                                st.write(f"**Cash Discount ({CONFIG.CASH_DISCOUNT_RATE*100}%):** -{format_currency(cash_discount)}")
-                            with col_s2:
-                                st.write(f"**Labour (₹{CONFIG.LABOUR_CHARGE_PER_QUINTAL}/Q):** -{format_currency(labour_charge)}")
-                                st.write(f"**Transport (₹{CONFIG.TRANSPORT_CHARGE_PER_QUINTAL}/Q):** -{format_currency(transport_charge)}")
+                            amounts = [format_currency(base_amount)] + [
+                                f"-{format_currency(amount)}"
+                                for amount in (cash_discount, labour_charge, transport_charge)
+                            ]
+                            st.markdown(
+                                breakdown_grid_html(list(zip(_BREAKDOWN_LABELS, amounts))),
+                                unsafe_allow_html=True
+                            )
                             st.markdown(f"### Total Revenue: {format_currency(total_amount)}")
                 except ValueError as e:
                     display_error_message(f"Calculation error: {e}")
@@ -3,61 +3,65 @@ Settings page for the Buying & Selling Dashboard Application.
 """
 
 import os
+from collections import deque
 from datetime import datetime
 import streamlit as st
 import pandas as pd
 
 from config import CONFIG
-from database import get_all_transactions
+from database import get_database_size, get_transaction_count
+from styles import page_header_html
 from utils import display_error_message
 from logger_setup import logger
 
 
+_HEADER_HTML = page_header_html(
+    "⚙️ Settings",
+    "Configure and monitor your application",
+    "#718096", "#4a5568"
+)
+
+# CONFIG is frozen, so the table is built once at import
+_CONFIG_DF = pd.DataFrame({
+    "Setting": [
+        "Database Path", "Mandi Charge Rate", "Muddat Rate", "Cash Discount Rate",
+        "Tractor Rent (per Quintal)", "Labour Charge (per Quintal)", "Transport Charge (per Quintal)",
+        "Max Quantity (Quintal)", "Max Price per Unit (₹)", "Max Total Amount (₹)"
+    ],
+    "Value": [
+        CONFIG.DB_PATH,
+        f"{CONFIG.MANDI_CHARGE_RATE * 100}%",
+        f"{CONFIG.MUDDAT_RATE * 100}%",
+        f"{CONFIG.CASH_DISCOUNT_RATE * 100}%",
+        f"₹{CONFIG.TRACTOR_RENT_PER_QUINTAL}",
+        f"₹{CONFIG.LABOUR_CHARGE_PER_QUINTAL}",
+        f"₹{CONFIG.TRANSPORT_CHARGE_PER_QUINTAL}",
+        f"{CONFIG.MAX_QUANTITY}",
+        f"₹{CONFIG.MAX_PRICE}",
+        f"₹{CONFIG.MAX_AMOUNT}"
+    ]
+})
+
+
 def render_settings() -> None:
     """Render the settings page."""
-    st.markdown("""
-    <div style='background: linear-gradient(135deg, #718096 0%, #4a5568 100%); 
-                padding: 1.5rem; border-radius: 12px; margin-bottom: 2rem;'>
-        <h2 style='color: white; margin: 0; font-size: 1.8rem;'>⚙️ Settings</h2>
-        <p style='color: rgba(255,255,255,0.9); margin: 0.5rem 0 0 0;'>Configure and monitor your application</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
     
     st.markdown("### 📋 Current Configuration")
     
-    config_data = {
-        "Setting": [
-            "Database Path", "Mandi Charge Rate", "Muddat Rate", "Cash Discount Rate",
-            "Tractor Rent (per Quintal)", "Labour Charge (per Quintal)", "Transport Charge (per Quintal)",
-            "Max Quantity (Quintal)", "Max Price per Unit (₹)", "Max Total Amount (₹)"
-        ],
-        "Value": [
-            CONFIG.DB_PATH,
-            f"{CONFIG.MANDI_CHARGE_RATE * 100}%",
-            f"{CONFIG.MUDDAT_RATE * 100}%",
-            f"{CONFIG.CASH_DISCOUNT_RATE * 100}%",
-            f"₹{CONFIG.TRACTOR_RENT_PER_QUINTAL}",
-            f"₹{CONFIG.LABOUR_CHARGE_PER_QUINTAL}",
-            f"₹{CONFIG.TRANSPORT_CHARGE_PER_QUINTAL}",
-            f"{CONFIG.MAX_QUANTITY}",
-            f"₹{CONFIG.MAX_PRICE}",
-            f"₹{CONFIG.MAX_AMOUNT}"
-        ]
-    }
-    
-    st.dataframe(pd.DataFrame(config_data), use_container_width=True)
+    st.dataframe(_CONFIG_DF, use_container_width=True)
     
     st.divider()
     st.markdown("### 💾 Database Information")
     
     try:
-        df = get_all_transactions()
-        if not df.empty:
+        transaction_count = get_transaction_count()
+        if transaction_count > 0:
             col1, col2, col3 = st.columns(3)
             with col1:
-                st.metric("📊 Total Transactions", len(df))
+                st.metric("📊 Total Transactions", transaction_count)
             with col2:
-                db_size = os.path.getsize(CONFIG.DB_PATH) / 1024
+                db_size = get_database_size() / 1024
                 st.metric("💾 Database Size (KB)", f"{db_size:.2f}")
             with col3:
                 last_updated = st.session_state.get('last_refresh', 'N/A')
@@ -73,10 +77,10 @@ def render_settings() -> None:
     log_file = os.path.join("logs", f"app_{datetime.now().strftime('%Y%m%d')}.log")
     if os.path.exists(log_file):
         try:
+            # Stream the file, keeping only the last 20 lines in memory
             with open(log_file, 'r', encoding='utf-8') as f:
-                log_lines = f.readlines()
-                recent_logs = log_lines[-20:]
-                st.text_area("Recent Logs", value=''.join(recent_logs), height=200, disabled=True)
+                recent_logs = deque(f, maxlen=20)
+            st.text_area("Recent Logs", value=''.join(recent_logs), height=200, disabled=True)
         except Exception as e:
             display_error_message(f"Error reading log file: {e}")
     else:
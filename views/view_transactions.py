@@ -2,136 +2,242 @@
 View Transactions page for the Buying & Selling Dashboard Application.
 """
 
-import time
 from datetime import datetime
 import streamlit as st
 
-from database import get_all_transactions, delete_transaction
+from database import (
+    get_transaction_count, get_transaction_totals, get_transactions, get_transactions_csv,
+    delete_transaction
+)
+from styles import page_header_html
 from utils import format_currency, display_error_message
 from logger_setup import logger
 
 
+_HEADER_HTML = page_header_html(
+    "📋 All Transactions",
+    "View, filter, and manage all your transactions",
+    "#4299e1", "#3182ce"
+)
+
+# Rows per page in the results table
+_PAGE_SIZE = 50
+
+# Results table columns; init_database guarantees all of them exist
+_DISPLAY_COLUMNS = ['id', 'transaction_type', 'item_name', 'quantity_kg',
+                    'price_per_unit', 'total_amount', 'transaction_date', 'status']
+
+_FILTER_CARD_HTML = """
+<div style='background: white; padding: 1.5rem; border-radius: 12px; 
+           box-shadow: 0 4px 6px rgba(0,0,0,0.1); margin-bottom: 1.5rem;'>
+    <h3 style='color: #1a1a2e; margin-top: 0;'>🔍 Filter Transactions</h3>
+</div>
+"""
+
+_DELETE_CARD_HTML = """
+<div style='background: linear-gradient(135deg, #f5656515 0%, #e53e3e15 100%); 
+           padding: 1.5rem; border-radius: 12px; border-left: 4px solid #f56565; margin-bottom: 1.5rem;'>
+    <h3 style='color: #1a1a2e; margin-top: 0;'>🗑️ Delete Transaction</h3>
+    <p style='color: #4a5568; margin: 0;'>
+        Select a transaction to permanently delete it from the database
+    </p>
+</div>
+"""
+
+_NO_RESULTS_HTML = """
+<div style='background: linear-gradient(135deg, #667eea15 0%, #764ba215 100%); 
+           padding: 3rem; border-radius: 12px; text-align: center; border-left: 4px solid #667eea;'>
+    <div style='font-size: 4rem; margin-bottom: 1rem;'>🔍</div>
+    <h3 style='color: #1a1a2e; margin: 0 0 0.5rem 0;'>No Transactions Found</h3>
+    <p style='color: #4a5568; margin: 0;'>
+        Try adjusting your filters or search terms
+    </p>
+</div>
+"""
+
+_EMPTY_STATE_HTML = """
+<div style='background: linear-gradient(135deg, #667eea15 0%, #764ba215 100%); 
+           padding: 3rem; border-radius: 12px; text-align: center; border-left: 4px solid #667eea;'>
+    <div style='font-size: 4rem; margin-bottom: 1rem;'>📝</div>
+    <h3 style='color: #1a1a2e; margin: 0 0 0.5rem 0;'>No Transactions Yet</h3>
+    <p style='color: #4a5568; margin: 0;'>
+        Start by recording your first transaction to see them here
+    </p>
+</div>
+"""
+
+_SECTION_DIVIDER_HTML = "<hr style='margin: 2rem 0;'>"
+
+_RESULTS_CARD_TPL = """
+<div style='background: white; padding: 1.5rem; border-radius: 12px; 
+           box-shadow: 0 4px 6px rgba(0,0,0,0.1); margin-bottom: 1.5rem;'>
+    <h3 style='color: #1a1a2e; margin-top: 0;'>📊 Transaction Results ({count} records)</h3>
+</div>
+"""
+
+_CONFIRM_DELETE_TPL = """
+<div style='background: linear-gradient(135deg, #ed893615 0%, #dd6b2015 100%); 
+           padding: 1.5rem; border-radius: 12px; border-left: 4px solid #ed8936; margin-bottom: 1.5rem;'>
+    <div style='display: flex; align-items: center;'>
+        <div style='font-size: 2rem; margin-right: 1rem;'>⚠️</div>
+        <div>
+            <h4 style='color: #c05621; margin: 0 0 0.25rem 0;'>
+                Confirm Deletion
+            </h4>
+            <p style='color: #c05621; margin: 0;'>
+                Are you sure you want to delete Transaction ID {id}? This action cannot be undone!
+            </p>
+        </div>
+    </div>
+</div>
+"""
+
+_DELETED_TPL = """
+<div style='background: linear-gradient(135deg, #48bb7815 0%, #38a16915 100%); 
+           padding: 1.5rem; border-radius: 12px; border-left: 4px solid #48bb78;'>
+    <div style='display: flex; align-items: center;'>
+        <div style='font-size: 2rem; margin-right: 1rem;'>✅</div>
+        <div>
+            <h4 style='color: #065f46; margin: 0 0 0.25rem 0;'>
+                Transaction Deleted Successfully!
+            </h4>
+            <p style='color: #065f46; margin: 0;'>
+                Transaction ID {id} has been permanently removed
+            </p>
+        </div>
+    </div>
+</div>
+"""
+
+_SUMMARY_HEADER_HTML = """
+<div style='background: white; padding: 1.5rem; border-radius: 12px; 
+           box-shadow: 0 4px 6px rgba(0,0,0,0.1); margin-bottom: 1.5rem;'>
+    <h3 style='color: #1a1a2e; margin-top: 0;'>📈 Summary</h3>
+</div>
+"""
+
+_SUMMARY_GRID_TPL = (
+    "<div style='display: grid; grid-template-columns: repeat(3, 1fr); gap: 1rem;'>"
+    "{cards}</div>"
+)
+
+# No blank lines inside: the cards are joined into one grid and a blank
+# line would end the markdown HTML block midway through it
+_SUMMARY_CARD_TPL = (
+    "<div style='background: white; padding: 1.5rem; border-radius: 12px; "
+    "box-shadow: 0 4px 6px rgba(0,0,0,0.1); text-align: center;'>"
+    "<div style='font-size: 2rem; font-weight: 700; color: {color}; margin-bottom: 0.5rem;'>"
+    "{value}</div>"
+    "<div style='color: #4a5568; font-weight: 600; font-size: 0.9rem;'>{label}</div>"
+    "</div>"
+)
+
+
 def render_view_transactions() -> None:
     """Render the view transactions page."""
-    st.markdown("""
-    <div style='background: linear-gradient(135deg, #4299e1 0%, #3182ce 100%); 
-                padding: 1.5rem; border-radius: 12px; margin-bottom: 2rem;'>
-        <h2 style='color: white; margin: 0; font-size: 1.8rem;'>
-            📋 All Transactions
-        </h2>
-        <p style='color: rgba(255,255,255,0.9); margin: 0.5rem 0 0 0;'>
-            View, filter, and manage all your transactions
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
+    
+    deleted_id = st.session_state.pop('tx_deleted_id', None)
+    if deleted_id is not None:
+        st.markdown(_DELETED_TPL.format(id=deleted_id), unsafe_allow_html=True)
+        st.balloons()
     
     try:
-        df = get_all_transactions()
-        
-        if not df.empty:
+        if get_transaction_count() > 0:
             # Filter options
-            st.markdown("""
-            <div style='background: white; padding: 1.5rem; border-radius: 12px; 
-                       box-shadow: 0 4px 6px rgba(0,0,0,0.1); margin-bottom: 1.5rem;'>
-                <h3 style='color: #1a1a2e; margin-top: 0;'>🔍 Filter Transactions</h3>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_FILTER_CARD_HTML, unsafe_allow_html=True)
             
             col_filter1, col_filter2, col_filter3 = st.columns(3)
             
             with col_filter1:
-                st.markdown("""
-                <div style='margin-bottom: 0.5rem;'>
-                    <label style='color: #1a1a2e; font-weight: 600;'>Filter by Type</label>
-                </div>
-                """, unsafe_allow_html=True)
                 transaction_type_filter = st.selectbox(
-                    "",
+                    "Filter by Type",
                     ["All", "BUY", "SELL"],
                     index=0,
-                    label_visibility="collapsed"
+                    key="tx_type_filter"
                 )
             
             with col_filter2:
-                st.markdown("""
-                <div style='margin-bottom: 0.5rem;'>
-                    <label style='color: #1a1a2e; font-weight: 600;'>Filter by Status</label>
-                </div>
-                """, unsafe_allow_html=True)
                 status_filter = st.selectbox(
-                    "",
+                    "Filter by Status",
                     ["All", "PENDING", "SOLD", "COMPLETED"],
                     index=0,
-                    label_visibility="collapsed"
+                    key="tx_status_filter"
                 )
             
             with col_filter3:
-                st.markdown("""
-                <div style='margin-bottom: 0.5rem;'>
-                    <label style='color: #1a1a2e; font-weight: 600;'>Search Item Name</label>
-                </div>
-                """, unsafe_allow_html=True)
                 search_item = st.text_input(
-                    "",
+                    "Search Item Name",
                     placeholder="Type to search...",
-                    label_visibility="collapsed"
+                    key="tx_item_search"
                 )
             
-            # Apply filters
-            filtered_df = df.copy()
-            
-            if transaction_type_filter != "All":
-                filtered_df = filtered_df[filtered_df['transaction_type'] == transaction_type_filter]
-            
-            if status_filter != "All":
-                filtered_df = filtered_df[filtered_df['status'] == status_filter]
+            # Filter in SQL
+            filter_args = (
+                None if transaction_type_filter == "All" else transaction_type_filter,
+                None if status_filter == "All" else status_filter,
+                search_item.strip() or None,
+            )
+            # Count and totals come from one SQL aggregate; only the visible
+            # page of rows is ever fetched
+            totals = get_transaction_totals(*filter_args)
             
-            if search_item:
-                filtered_df = filtered_df[
-                    filtered_df['item_name'].str.contains(search_item, case=False, na=False)
-                ]
-            
-            # Display table
-            display_columns = ['id', 'transaction_type', 'item_name', 'quantity_kg', 
-                             'price_per_unit', 'total_amount', 'transaction_date', 'status']
-            available_columns = [col for col in display_columns if col in filtered_df.columns]
-            
-            if not filtered_df.empty:
-                st.markdown(f"""
-                <div style='background: white; padding: 1.5rem; border-radius: 12px; 
-                           box-shadow: 0 4px 6px rgba(0,0,0,0.1); margin-bottom: 1.5rem;'>
-                    <h3 style='color: #1a1a2e; margin-top: 0;'>📊 Transaction Results ({len(filtered_df)} records)</h3>
-                </div>
-                """, unsafe_allow_html=True)
+            if totals['total_transactions'] > 0:
+                st.markdown(_RESULTS_CARD_TPL.format(count=totals['total_transactions']), unsafe_allow_html=True)
+                
+                # Keyset pagination: show rows with id below the current cursor
+                if st.session_state.get('tx_page_filters') != filter_args:
+                    st.session_state.tx_page_filters = filter_args
+                    st.session_state.tx_page_cursors = []
+                cursors = st.session_state.tx_page_cursors
+                # One extra row tells whether an older page exists
+                page_df = get_transactions(
+                    *filter_args, before_id=cursors[-1] if cursors else None, limit=_PAGE_SIZE + 1
+                )
+                if page_df.empty and cursors:
+                    # Every row past the cursor was deleted; start from the newest again
+                    cursors.clear()
+                    page_df = get_transactions(*filter_args, limit=_PAGE_SIZE + 1)
+                has_older = len(page_df) > _PAGE_SIZE
+                page_df = page_df.head(_PAGE_SIZE)
                 
                 st.dataframe(
-                    filtered_df[available_columns].rename(columns={'quantity_kg': 'Quantity (Quintal)'}),
+                    page_df[_DISPLAY_COLUMNS].rename(columns={'quantity_kg': 'Quantity (Quintal)'}),
                     use_container_width=True,
+                    hide_index=True,
                     height=400
                 )
                 
+                col_page1, col_page2, col_page3 = st.columns([1, 2, 1])
+                with col_page1:
+                    st.button("← Newer", use_container_width=True, key="tx_page_newer",
+                              disabled=not cursors, on_click=cursors.pop)
+                with col_page2:
+                    st.caption(f"Page {len(cursors) + 1}")
+                with col_page3:
+                    st.button("Older →", use_container_width=True, key="tx_page_older",
+                              disabled=not has_older,
+                              on_click=cursors.append, args=(int(page_df['id'].iloc[-1]),))
+                
                 # Delete transaction section
-                st.markdown("<hr style='margin: 2rem 0;'>", unsafe_allow_html=True)
-                st.markdown("""
-                <div style='background: linear-gradient(135deg, #f5656515 0%, #e53e3e15 100%); 
-                           padding: 1.5rem; border-radius: 12px; border-left: 4px solid #f56565; margin-bottom: 1.5rem;'>
-                    <h3 style='color: #1a1a2e; margin-top: 0;'>🗑️ Delete Transaction</h3>
-                    <p style='color: #4a5568; margin: 0;'>
-                        Select a transaction to permanently delete it from the database
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(_SECTION_DIVIDER_HTML, unsafe_allow_html=True)
+                st.markdown(_DELETE_CARD_HTML, unsafe_allow_html=True)
                 
                 col_del1, col_del2 = st.columns([3, 1])
                 
                 with col_del1:
-                    trans_list = filtered_df.reset_index(drop=True)
-                    selected_idx = st.selectbox(
+                    # Rows on the current page only
+                    ids = page_df['id'].astype(int)
+                    labels = (
+                        'ID ' + ids.astype(str) + ' - ' + page_df['item_name'].astype(str)
+                        + ' (' + page_df['transaction_type'].astype(str) + ')'
+                    )
+                    delete_labels = dict(zip(ids.tolist(), labels.tolist()))
+                    trans_id_to_delete = st.selectbox(
                         "Select transaction to delete",
-                        options=range(len(trans_list)),
-                        format_func=lambda x: f"ID {int(trans_list.iloc[x]['id'])} - {trans_list.iloc[x]['item_name']} ({trans_list.iloc[x]['transaction_type']})"
+                        options=list(delete_labels),
+                        format_func=delete_labels.get
                     )
-                    trans_id_to_delete = int(trans_list.iloc[selected_idx]['id'])
                 
                 with col_del2:
                     st.write("")
@@ -140,148 +246,66 @@ def render_view_transactions() -> None:
                         st.session_state.show_delete_confirmation = True
                         st.session_state.transaction_to_delete = trans_id_to_delete
                 
-                # Show confirmation if needed
+                # Confirmation dialog in its own slot, replaced as a unit
+                confirm_area = st.empty()
                 if (st.session_state.get('show_delete_confirmation', False) and 
                     st.session_state.get('transaction_to_delete') == trans_id_to_delete):
-                    st.markdown(f"""
-                    <div style='background: linear-gradient(135deg, #ed893615 0%, #dd6b2015 100%); 
-                               padding: 1.5rem; border-radius: 12px; border-left: 4px solid #ed8936; margin-bottom: 1.5rem;'>
-                        <div style='display: flex; align-items: center;'>
-                            <div style='font-size: 2rem; margin-right: 1rem;'>⚠️</div>
-                            <div>
-                                <h4 style='color: #c05621; margin: 0 0 0.25rem 0;'>
-                                    Confirm Deletion
-                                </h4>
-                                <p style='color: #c05621; margin: 0;'>
-                                    Are you sure you want to delete Transaction ID {trans_id_to_delete}? This action cannot be undone!
-                                </p>
-                            </div>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    with confirm_area.container():
+                        st.markdown(_CONFIRM_DELETE_TPL.format(id=trans_id_to_delete), unsafe_allow_html=True)
+                        
+                        col_confirm1, col_confirm2, _ = st.columns(3)
+                        with col_confirm1:
+                            confirmed = st.button("✅ Yes, Delete", use_container_width=True, key="confirm_delete_yes")
+                        with col_confirm2:
+                            cancelled = st.button("❌ Cancel", use_container_width=True, key="confirm_delete_no")
                     
-                    col_confirm1, col_confirm2, col_confirm3 = st.columns(3)
-                    
-                    with col_confirm1:
-                        if st.button("✅ Yes, Delete", use_container_width=True, key="confirm_delete_yes"):
-                            if delete_transaction(trans_id_to_delete):
-                                st.session_state.show_delete_confirmation = False
-                                st.session_state.transaction_to_delete = None
-                                st.markdown(f"""
-                                <div style='background: linear-gradient(135deg, #48bb7815 0%, #38a16915 100%); 
-                                           padding: 1.5rem; border-radius: 12px; border-left: 4px solid #48bb78;'>
-                                    <div style='display: flex; align-items: center;'>
-                                        <div style='font-size: 2rem; margin-right: 1rem;'>✅</div>
-                                        <div>
-                                            <h4 style='color: #065f46; margin: 0 0 0.25rem 0;'>
-                                                Transaction Deleted Successfully!
-                                            </h4>
-                                            <p style='color: #065f46; margin: 0;'>
-                                                Transaction ID {trans_id_to_delete} has been permanently removed
-                                            </p>
-                                        </div>
-                                    </div>
-                                </div>
-                                """, unsafe_allow_html=True)
-                                st.balloons()
-                                time.sleep(1)
-                                st.rerun()
-                    
-                    with col_confirm2:
-                        if st.button("❌ Cancel", use_container_width=True, key="confirm_delete_no"):
+                    if confirmed:
+                        if delete_transaction(trans_id_to_delete):
                             st.session_state.show_delete_confirmation = False
                             st.session_state.transaction_to_delete = None
+                            # Shown once by the next run; delete_transaction
+                            # already cleared the cached reads
+                            st.session_state.tx_deleted_id = trans_id_to_delete
                             st.rerun()
-                    
-                    with col_confirm3:
-                        st.write("")
-            else:
-                st.markdown("""
-                <div style='background: linear-gradient(135deg, #667eea15 0%, #764ba215 100%); 
-                           padding: 3rem; border-radius: 12px; text-align: center; border-left: 4px solid #667eea;'>
-                    <div style='font-size: 4rem; margin-bottom: 1rem;'>🔍</div>
-                    <h3 style='color: #1a1a2e; margin: 0 0 0.5rem 0;'>No Transactions Found</h3>
-                    <p style='color: #4a5568; margin: 0;'>
-                        Try adjusting your filters or search terms
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Summary of filtered transactions
-            if not filtered_df.empty:
-                st.markdown("<hr style='margin: 2rem 0;'>", unsafe_allow_html=True)
-                st.markdown("""
-                <div style='background: white; padding: 1.5rem; border-radius: 12px; 
-                           box-shadow: 0 4px 6px rgba(0,0,0,0.1); margin-bottom: 1.5rem;'>
-                    <h3 style='color: #1a1a2e; margin-top: 0;'>📈 Summary</h3>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                col_sum1, col_sum2, col_sum3 = st.columns(3)
+                    elif cancelled:
+                        st.session_state.show_delete_confirmation = False
+                        st.session_state.transaction_to_delete = None
+                        st.rerun()
                 
-                with col_sum1:
-                    buy_total = filtered_df[filtered_df['transaction_type'] == 'BUY']['total_amount'].sum()
-                    st.markdown(f"""
-                    <div style='background: white; padding: 1.5rem; border-radius: 12px; 
-                               box-shadow: 0 4px 6px rgba(0,0,0,0.1); text-align: center;'>
-                        <div style='font-size: 2rem; font-weight: 700; color: #667eea; margin-bottom: 0.5rem;'>
-                            {format_currency(buy_total)}
-                        </div>
-                        <div style='color: #4a5568; font-weight: 600; font-size: 0.9rem;'>
-                            💰 Buy Total
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                # Summary of filtered transactions
+                st.markdown(_SECTION_DIVIDER_HTML, unsafe_allow_html=True)
+                st.markdown(_SUMMARY_HEADER_HTML, unsafe_allow_html=True)
                 
-                with col_sum2:
-                    sell_total = filtered_df[filtered_df['transaction_type'] == 'SELL']['total_amount'].sum()
-                    st.markdown(f"""
-                    <div style='background: white; padding: 1.5rem; border-radius: 12px; 
-                               box-shadow: 0 4px 6px rgba(0,0,0,0.1); text-align: center;'>
-                        <div style='font-size: 2rem; font-weight: 700; color: #48bb78; margin-bottom: 0.5rem;'>
-                            {format_currency(sell_total)}
-                        </div>
-                        <div style='color: #4a5568; font-weight: 600; font-size: 0.9rem;'>
-                            💵 Sell Total
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col_sum3:
-                    net = sell_total - buy_total
-                    net_color = "#48bb78" if net >= 0 else "#f56565"
-                    st.markdown(f"""
-                    <div style='background: white; padding: 1.5rem; border-radius: 12px; 
-                               box-shadow: 0 4px 6px rgba(0,0,0,0.1); text-align: center;'>
-                        <div style='font-size: 2rem; font-weight: 700; color: {net_color}; margin-bottom: 0.5rem;'>
-                            {format_currency(net)}
-                        </div>
-                        <div style='color: #4a5568; font-weight: 600; font-size: 0.9rem;'>
-                            📊 Net P/L
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                buy_total = totals['total_buy']
+                sell_total = totals['total_sell']
+                net = sell_total - buy_total
+                net_color = "#48bb78" if net >= 0 else "#f56565"
+                cards = (
+                    ("#667eea", buy_total, "💰 Buy Total"),
+                    ("#48bb78", sell_total, "💵 Sell Total"),
+                    (net_color, net, "📊 Net P/L"),
+                )
+                st.markdown(_SUMMARY_GRID_TPL.format(cards="".join(
+                    _SUMMARY_CARD_TPL.format(color=color, value=format_currency(amount), label=label)
+                    for color, amount, label in cards
+                )), unsafe_allow_html=True)
                 
                 # Export option
-                st.markdown("<hr style='margin: 2rem 0;'>", unsafe_allow_html=True)
-                csv = filtered_df.to_csv(index=False)
-                st.download_button(
-                    label="📥 Download Transactions as CSV",
-                    data=csv,
-                    file_name=f"transactions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
+                st.markdown(_SECTION_DIVIDER_HTML, unsafe_allow_html=True)
+                # The export needs every matching row, so it is only built on request
+                if st.button("📄 Prepare CSV Export", key="tx_prepare_export"):
+                    st.session_state.tx_export_filters = filter_args
+                if st.session_state.get('tx_export_filters') == filter_args:
+                    st.download_button(
+                        label="📥 Download Transactions as CSV",
+                        data=get_transactions_csv(*filter_args),
+                        file_name=f"transactions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                        mime="text/csv"
+                    )
+            else:
+                st.markdown(_NO_RESULTS_HTML, unsafe_allow_html=True)
         else:
-            st.markdown("""
-            <div style='background: linear-gradient(135deg, #667eea15 0%, #764ba215 100%); 
-                       padding: 3rem; border-radius: 12px; text-align: center; border-left: 4px solid #667eea;'>
-                <div style='font-size: 4rem; margin-bottom: 1rem;'>📝</div>
-                <h3 style='color: #1a1a2e; margin: 0 0 0.5rem 0;'>No Transactions Yet</h3>
-                <p style='color: #4a5568; margin: 0;'>
-                    Start by recording your first transaction to see them here
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_EMPTY_STATE_HTML, unsafe_allow_html=True)
             
     except Exception as e:
         logger.error(f"Error rendering view transactions: {e}")